@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+asyncio 기반 상영 조회 엔진
+스레드 대신 코루틴으로 (영화관, 날짜) 조회를 동시에 실행합니다.
+aiohttp가 설치되어 있지 않으면 사용할 수 없습니다 (available()로 확인).
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+from concurrency import RETRY_ATTEMPTS, RetryableError, backoff_delay, check_status
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# 호스트별 동시 요청 수 (환경변수로 조정)
+PER_HOST_LIMIT = int(os.environ.get("ASYNC_PER_HOST_LIMIT", "50"))
+REQUEST_TIMEOUT = 10
+
+
+def available():
+    """aiohttp 설치 여부"""
+    return aiohttp is not None
+
+
+class _AsyncGate:
+    """AdaptiveLimiter의 동시 요청 한도를 코루틴에 적용"""
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self.cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self.cond:
+            await self.cond.wait_for(lambda: self.limiter.in_flight < int(self.limiter.limit))
+            self.limiter.in_flight += 1
+
+    async def release(self, ok, latency):
+        self.limiter.in_flight -= 1
+        self.limiter.record(ok, latency)
+        async with self.cond:
+            self.cond.notify_all()
+
+
+async def _fetch(session, gate, url, kwargs, decode):
+    error = None
+
+    for attempt in range(RETRY_ATTEMPTS):
+        if attempt:
+            await asyncio.sleep(backoff_delay(attempt))
+
+        await gate.acquire()
+        start = time.monotonic()
+        ok = False
+        try:
+            async with session.post(url, **kwargs) as response:
+                check_status(response.status)
+                body = await response.read()
+            result = decode(body)
+            ok = True
+            return result
+        except (aiohttp.ClientError, asyncio.TimeoutError, RetryableError, ValueError) as e:
+            error = e
+        finally:
+            await gate.release(ok, time.monotonic() - start)
+
+    raise error
+
+
+async def _run_job(session, semaphores, gate, url, kwargs, decode):
+    host = urlparse(url).netloc
+    async with semaphores[host]:
+        try:
+            return await _fetch(session, gate, url, kwargs, decode)
+        except Exception as e:
+            print(f"[{datetime.now()}] 조회 실패: {e!r}")
+            return {}
+
+
+async def _scan(jobs, limiter, per_host, label):
+    semaphores = {}
+    for url, _, _ in jobs:
+        semaphores.setdefault(urlparse(url).netloc, asyncio.Semaphore(per_host))
+
+    gate = _AsyncGate(limiter)
+    events = {}
+    connector = aiohttp.TCPConnector(limit=0, limit_per_host=per_host)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        tasks = [
+            asyncio.create_task(_run_job(session, semaphores, gate, url, kwargs, decode))
+            for url, kwargs, decode in jobs
+        ]
+
+        completed = 0
+        for task in asyncio.as_completed(tasks):
+            events.update(await task)
+            completed += 1
+
+            if completed % 200 == 0:
+                print(f"[{datetime.now()}] 진행: {completed}/{len(jobs)} {label}, 발견: {len(events)}개")
+
+    return events
+
+
+def run_scan(jobs, limiter, per_host=PER_HOST_LIMIT, label="요청"):
+    """조회 작업 목록을 코루틴으로 실행하고 이벤트를 합쳐서 반환
+
+    jobs: (url, 요청 kwargs, decode) 목록. decode는 응답 바이트를 받아
+    {event_id: event} dict를 반환합니다 (JSON이 아니면 ValueError). 동시 요청 수는 per_host 세마포어와
+    limiter(AdaptiveLimiter)가 함께 제한하고, 재시도 후에도 실패한 요청은
+    빈 결과로 처리됩니다.
+    """
+    return asyncio.run(_scan(jobs, limiter, per_host, label))
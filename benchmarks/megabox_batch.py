@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+메가박스 selectBokdList.do 지점 묶음 크기 벤치마크
+실제 API로 묶음 크기별 조회 시간과 결과 일치 여부를 측정합니다.
+
+사용법 (저장소 루트에서):
+    python -m benchmarks.megabox_batch [묶음 크기 ...]
+
+결과 일치는 이벤트만이 아니라 (지점, 날짜)별 전체 상영 행 수로 비교합니다 - 이벤트
+상영은 드물어서 묶음 응답이 일부 지점을 빠뜨려도 이벤트 목록은 같을 수 있기 때문입니다.
+지점을 알 수 없는 행(brchNo 없음)이 있어도 불일치입니다.
+결과가 단일 지점 조회(묶음 크기 1)와 같은 크기 중 가장 빠른 값을
+MEGABOX_BATCH_SIZE로 사용하면 됩니다. 상태 파일은 건드리지 않습니다.
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import megabox_monitor as mb
+
+DEFAULT_SIZES = [1, 2, 5, 10, 20]
+DAYS = 3
+
+
+def run(branches, dates, batch_size):
+    """묶음 크기 batch_size로 전체 조회
+
+    (events, {(brchNo, date): 상영 행 수}, 지점을 알 수 없는 행 수, 요청 수, 실패 수, 소요 시간) 반환
+    """
+    tasks = []
+    for date in dates:
+        for i in range(0, len(branches), batch_size):
+            tasks.append((branches[i:i + batch_size], date))
+
+    def fetch(task):
+        brchs, date = task
+        payload = mb.bokd_list_payload([b["brchNo"] for b in brchs], date)
+        try:
+            result = mb.SESSION.post(mb.MEGABOX_API_URL, headers=mb.MEGABOX_HEADERS, json=payload, timeout=10).json()
+        except Exception:
+            return None
+        shows_by_brch, unassigned = mb.split_batch_shows(brchs, result)
+        counts = {(brch_no, date): len(shows) for brch_no, shows in shows_by_brch.items()}
+        return mb.parse_batch_shows(brchs, date, result), counts, unassigned
+
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(fetch, tasks))
+    elapsed = time.time() - start
+
+    events = {}
+    counts = {}
+    unassigned = 0
+    failures = 0
+    for result in results:
+        if result is None:
+            failures += 1
+        else:
+            events.update(result[0])
+            counts.update(result[1])
+            unassigned += result[2]
+    return events, counts, unassigned, len(tasks), failures, elapsed
+
+
+def main():
+    sizes = [int(x) for x in sys.argv[1:]] or DEFAULT_SIZES
+    if 1 not in sizes:
+        sizes.insert(0, 1)
+
+    branches = mb.get_all_branches()
+    if not branches:
+        print("지점 목록을 가져올 수 없습니다.")
+        return
+    dates = [(datetime.now() + timedelta(days=i)).strftime("%Y%m%d") for i in range(DAYS)]
+
+    print(f"지점 {len(branches)}개, {DAYS}일")
+    print(f"{'묶음':>4} {'요청':>6} {'실패':>4} {'상영':>6} {'미배정':>6} {'이벤트':>6} {'시간(초)':>8}  결과 일치")
+
+    baseline = None
+    best = None
+    for size in sorted(sizes):
+        events, counts, unassigned, requests_made, failures, elapsed = run(branches, dates, size)
+        if baseline is None:
+            baseline = (set(events), counts)
+        matches = (set(events), counts) == baseline and unassigned == 0 and failures == 0
+        print(f"{size:>4} {requests_made:>6} {failures:>4} {sum(counts.values()):>6} {unassigned:>6} "
+              f"{len(events):>6} {elapsed:>8.2f}  {'O' if matches else 'X'}")
+        if matches and (best is None or elapsed < best[1]):
+            best = (size, elapsed)
+
+    if best:
+        print(f"\n권장 MEGABOX_BATCH_SIZE={best[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+메가박스 이벤트 분류 마이크로 벤치마크
+합성 영화 제목 10만 개로 기존 방식(키워드마다 lower() + 부분 문자열 검사를
+두 번)과 컴파일된 단일 정규식 분류기(event_classifier.classify_megabox)를
+비교합니다.
+
+사용법 (저장소 루트에서):
+    python -m benchmarks.megabox_classifier [제목 수]
+"""
+
+import random
+import sys
+import time
+
+from event_classifier import MEGABOX_EVENT_KEYWORDS, classify_megabox
+
+DEFAULT_COUNT = 100_000
+
+TITLES = [
+    "왕과 사는 남자", "프로젝트 Y", "주토피아 2", "아바타: 불과 재", "만약에 우리",
+    "하트맨", "나우 유 씨 미 3", "위키드: 포 굿", "극장판 체인소 맨: 레제편", "국보",
+]
+SUFFIXES = [
+    "", "", "", "", "", " 무대인사", " GV", " (관객과의 대화)", " 시사회", " 라이브뷰잉",
+    " LIVE", " 콘서트", " Sing-Along", " 응원상영", " Q&A", " 스페셜 토크", " 굿즈 패키지",
+]
+
+
+def legacy_classify(movie_name, event_div_cd=None):
+    """기존 is_event_show + matchedKeywords 계산"""
+    is_event = bool(event_div_cd)
+    if not is_event:
+        movie_name_lower = movie_name.lower()
+        for keyword in MEGABOX_EVENT_KEYWORDS:
+            if keyword.lower() in movie_name_lower:
+                is_event = True
+                break
+    matched_keywords = []
+    if is_event:
+        matched_keywords = [kw for kw in MEGABOX_EVENT_KEYWORDS if kw.lower() in movie_name.lower()]
+    return is_event, matched_keywords
+
+
+def make_corpus(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        (rng.choice(TITLES) + rng.choice(SUFFIXES), "01" if rng.random() < 0.02 else None)
+        for _ in range(count)
+    ]
+
+
+def measure(classify, corpus):
+    start = time.perf_counter()
+    results = [classify(*row) for row in corpus]
+    return time.perf_counter() - start, results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    corpus = make_corpus(count)
+
+    legacy_time, legacy_results = measure(legacy_classify, corpus)
+    new_time, new_results = measure(classify_megabox, corpus)
+
+    # 기존 방식은 이벤트가 아니면 키워드를 계산하지 않으므로 이벤트만 비교
+    mismatches = sum(
+        1 for (old_event, old_kw), (new_event, new_kw) in zip(legacy_results, new_results)
+        if old_event != new_event or (old_event and old_kw != new_kw)
+    )
+
+    print(f"제목 {count:,}개")
+    print(f"기존 방식:   {legacy_time:.3f}초 ({legacy_time / count * 1e6:.2f}µs/건)")
+    print(f"컴파일 분류: {new_time:.3f}초 ({new_time / count * 1e6:.2f}µs/건)")
+    print(f"속도 향상: {legacy_time / new_time:.1f}배, 결과 불일치: {mismatches}건")
+
+
+if __name__ == "__main__":
+    main()
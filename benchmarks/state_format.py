@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+이벤트 상태 파일 형식 벤치마크
+메가박스 이벤트와 같은 모양의 합성 이벤트로 기존 JSON(indent=2)과
+압축 형식(state_format.pack_events)의 파일 크기, 저장/불러오기 시간을 비교합니다.
+
+사용법 (저장소 루트에서):
+    python -m benchmarks.state_format [이벤트 수 ...]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from event_store import dump_json_events, load_json_events
+from state_format import codecs
+
+DEFAULT_COUNTS = [10_000, 100_000]
+
+BRANCHES = [("1372", "강남", "서울"), ("1351", "코엑스", "서울"), ("1371", "센트럴", "서울"), ("4062", "킨텍스", "경기")]
+MOVIES = [("25104301", "한스 짐머 시네마 콘서트", ["콘서트"]), ("25100900", "프로젝트 Y 무대인사", ["무대인사"]),
+          ("25101500", "주토피아 2 GV", ["GV"]), ("25102200", "위키드: 포 굿 싱어롱", ["싱어롱"])]
+
+
+def make_events(count, seed=0):
+    rng = random.Random(seed)
+    events = {}
+    for i in range(count):
+        brch_no, brch_nm, area = rng.choice(BRANCHES)
+        movie_no, movie_nm, keywords = rng.choice(MOVIES)
+        play_de = f"202602{rng.randint(1, 28):02d}"
+        start = f"{rng.randint(8, 23):02d}:{rng.choice(['00', '10', '20', '30', '40', '50'])}"
+        event_id = f"{brch_no}_{play_de}_{start}_{movie_no}_{i}"
+        events[event_id] = {
+            "id": event_id,
+            "playSchdlNo": f"{play_de[2:]}{brch_no}{i % 1000:03d}",
+            "movieNo": movie_no,
+            "movieNm": movie_nm,
+            "brchNo": brch_no,
+            "brchNm": brch_nm,
+            "areaCdNm": area,
+            "playDe": play_de,
+            "playStartTime": start,
+            "playEndTime": "23:59",
+            "theabExpoNm": f"{rng.randint(1, 12)}관",
+            "eventDivCdNm": None,
+            "restSeatCnt": rng.randint(0, 200),
+            "totSeatCnt": 200,
+            "bokdAbleAt": "Y",
+            "matchedKeywords": keywords,
+            "moviePosterImg": f"/SharedImg/2026/01/{rng.randint(1, 28):02d}/{movie_no}_150.jpg",
+        }
+    return events
+
+
+def measure(path, events):
+    start = time.perf_counter()
+    dump_json_events(path, events)
+    save_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loaded = load_json_events(path)
+    load_time = time.perf_counter() - start
+
+    return os.path.getsize(path), save_time, load_time, loaded == events
+
+
+def main():
+    counts = [int(x) for x in sys.argv[1:]] or DEFAULT_COUNTS
+    serializer, compressor = codecs()
+    print(f"압축 형식 코덱: {'msgpack' if serializer == b'm' else 'json'} + {'zstd' if compressor == b'z' else 'zlib'}")
+    print(f"{'이벤트':>8} {'형식':<6} {'크기':>12} {'저장(초)':>8} {'로드(초)':>8}  복원 일치")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in counts:
+            events = make_events(count)
+            for name, filename in (("json", "events.json"), ("packed", "events.bin")):
+                size, save_time, load_time, same = measure(os.path.join(tmp, filename), events)
+                print(f"{count:>8,} {name:<6} {size:>12,} {save_time:>8.3f} {load_time:>8.3f}  {'O' if same else 'X'}")
+
+
+if __name__ == "__main__":
+    main()
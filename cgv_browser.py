@@ -0,0 +1,780 @@
+#!/usr/bin/env python3
+"""
+CGV 예매 페이지 브라우저 조회 (Playwright async API)
+Chromium 하나에 격리된 브라우저 컨텍스트를 CGV_CONTEXTS개 열고, 컨텍스트마다
+대기열에서 극장을 하나씩 가져가 동시에 조회합니다. 컨텍스트는 쿠키/스토리지가
+서로 분리되고 스텔스 설정도 각각 적용됩니다.
+
+컨텍스트 하나당 렌더러 프로세스가 하나씩 늘어나므로 메모리가 부족하면
+CGV_CONTEXTS를 줄입니다 (1이면 기존처럼 극장을 순서대로 조회).
+
+고정 sleep 대신 DOM 변경/XHR 완료/로딩 오버레이 숨김을 기다리고, 조회가 끝나면
+단계별 대기 시간을 출력합니다.
+
+날짜를 누르면 페이지가 받아오는 상영 시간표 JSON 응답을 가로채서 바로 해석하고
+(cgv_schedule.py), 시간표 응답을 못 찾은 경우에만 화면 텍스트를 파싱합니다.
+시간표 응답을 받은 요청과 쿠키는 극장별로 기록해서 HTTP 직접 조회(cgv_http.py)에 넘깁니다.
+
+스크래퍼는 innerText와 버튼 위치만 읽으므로 이미지/동영상/폰트와 추적기 요청은
+컨텍스트에서 가로채 중단합니다 (CGV_BLOCK_RESOURCES=0이면 끔, CGV_BLOCK_ALLOW로 예외).
+"""
+
+import asyncio
+import os
+import re
+import time
+from collections import Counter
+from datetime import date, datetime
+from urllib.parse import urlparse
+
+from playwright.async_api import async_playwright
+from playwright_stealth import Stealth
+
+from cgv_http import cookie_records, date_format_of, make_template
+from cgv_schedule import build_greetings, report_unparsed, schedule_events
+from event_classifier import CGV_CLASSIFIER_JS
+
+CGV_URL = "https://cgv.co.kr/cnm/movieBook"
+
+# 동시에 조회할 브라우저 컨텍스트 수
+CGV_CONTEXTS = int(os.environ.get("CGV_CONTEXTS", "3"))
+
+# 불필요한 리소스 요청 차단 여부
+BLOCK_RESOURCES = os.environ.get("CGV_BLOCK_RESOURCES", "1") != "0"
+
+# 차단할 리소스 종류 (스타일시트는 버튼/날짜 위치 계산에 필요해서 유지)
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+# 차단할 추적기/광고 도메인 (하위 도메인 포함)
+TRACKER_DOMAINS = (
+    "google-analytics.com", "googletagmanager.com", "googleadservices.com", "doubleclick.net",
+    "facebook.net", "facebook.com", "criteo.com", "criteo.net", "wcs.naver.net",
+    "analytics.kakao.com", "clarity.ms", "hotjar.com", "appsflyer.com", "adobedtm.com",
+)
+
+# 차단하지 않을 URL (부분 문자열, 쉼표 구분 - Cloudflare 확인 페이지는 항상 허용)
+BLOCK_ALLOWLIST = ["challenges.cloudflare.com"] + [
+    item.strip() for item in os.environ.get("CGV_BLOCK_ALLOW", "").split(",") if item.strip()
+]
+
+# 상영 시간표 응답 가로채기 (0이면 항상 화면 텍스트 파싱)
+CAPTURE_SCHEDULE_API = os.environ.get("CGV_CAPTURE_API", "1") != "0"
+
+# 가로챌 응답 URL (정규식, JSON XHR/fetch 응답 중 상영 행이 있는 것만 사용)
+# 기본값은 CGV 도메인의 시간표 경로(schd/schedule/scn/showtime)만 - 다른 API 응답이 섞이지 않도록
+SCHEDULE_API_PATTERN = re.compile(os.environ.get(
+    "CGV_SCHEDULE_API", r"cgv\.co\.kr/[^?#]*(?:[Ss]chd|[Ss]chedule|[Ss]cn|[Ss]howtime)"
+))
+
+# 고정 sleep 대신 조건 대기: DOM 변경이 이 시간(ms) 동안 없으면 화면이 갱신된 것으로 봄
+SETTLE_QUIET_MS = int(os.environ.get("CGV_SETTLE_QUIET_MS", "200"))
+# 조건 대기 최대 시간 (ms)
+SETTLE_TIMEOUT_MS = 5000
+
+# 로딩 오버레이
+LOADING_SELECTOR = ".loading_pageContainer__fvLY_"
+
+# 단계별 기존 고정 대기 시간 (초, 타이밍 로그 비교용)
+FIXED_WAITS = {
+    "페이지 로드": 3.5,
+    "페이지 새로고침": 1.0,
+    "극장 선택 팝업": 0.8,
+    "지역 선택": 0.5,
+    "극장 클릭": 0.5,
+    "날짜 캘린더 로드": 1.5,
+    "날짜 선택": 1.4,
+    "스크롤 로드": 1.0,
+    "날짜 범위 이동": 0.8,
+}
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+VIEWPORT = {"width": 1920, "height": 1080}
+
+# 극장 선택 팝업의 "극장선택" 버튼 클릭
+CLICK_THEATER_BUTTON_JS = '''() => {
+    const elements = document.querySelectorAll('button, a, div, span');
+    for (const el of elements) {
+        const text = (el.innerText || '').trim();
+        if (text === '극장선택') {
+            el.click();
+            return true;
+        }
+    }
+    return false;
+}'''
+
+# 캘린더에서 주말 날짜 추출 (오탐지 방지)
+WEEKEND_DATES_JS = """() => {
+    var results = [];
+    // 캘린더 영역 상단 350px 이내의 요소만 검색
+    var elements = document.querySelectorAll('li, button, div, span, a');
+    for (var i = 0; i < elements.length; i++) {
+        var el = elements[i];
+        var rect = el.getBoundingClientRect();
+        // 캘린더는 상단에 위치 (y: 50~350)
+        if (rect.top < 50 || rect.top > 350) continue;
+        if (rect.height < 10 || rect.height > 80) continue;
+
+        var text = (el.innerText || '').trim();
+        var match = text.match(/^(토|일)\\n(\\d{1,2})$/);
+        if (match) {
+            results.push({day: match[1], date: match[2].replace(/^0/, '') || '0'});
+        }
+    }
+    return results;
+}"""
+
+# 날짜 요소를 화면 가운데로 스크롤
+SCROLL_TO_DATE_JS = """(args) => {
+    var day = args.day;
+    var dateNum = args.dateNum;
+    var datePadded = args.datePadded;
+    var items = document.querySelectorAll('li, button, div, span, a');
+    for (var i = 0; i < items.length; i++) {
+        var item = items[i];
+        var rect = item.getBoundingClientRect();
+        if (rect.top > 350 || rect.top < 0) continue;
+        var text = (item.innerText || '').trim();
+        if (text === day + '\\n' + datePadded ||
+            text === day + '\\n' + dateNum) {
+            item.scrollIntoView({behavior: 'instant', block: 'center', inline: 'center'});
+            return {found: true, text: text};
+        }
+    }
+    return {found: false};
+}"""
+
+# 날짜 요소 비활성 여부 (부모 요소까지 확인)
+DATE_DISABLED_JS = """el => {
+    if (el.disabled || el.className.includes('disabled')) return true;
+    var parent = el.parentElement;
+    for (var i = 0; i < 3 && parent; i++) {
+        if (parent.disabled || parent.className.includes('disabled')) return true;
+        var style = window.getComputedStyle(parent);
+        if (style.opacity < 0.5 || style.pointerEvents === 'none') return true;
+        parent = parent.parentElement;
+    }
+    var myStyle = window.getComputedStyle(el);
+    if (myStyle.opacity < 0.5 || myStyle.pointerEvents === 'none') return true;
+    return false;
+}"""
+
+# locator로 못 누른 날짜를 JavaScript로 직접 클릭
+CLICK_DATE_JS = """(args) => {
+    var day = args.day;
+    var dateNum = args.dateNum;
+    var datePadded = args.datePadded;
+    var items = document.querySelectorAll('li, button, div, span, a');
+    for (var i = 0; i < items.length; i++) {
+        var item = items[i];
+        var rect = item.getBoundingClientRect();
+        if (rect.top > 350 || rect.top < 0) continue;
+        var text = (item.innerText || '').trim();
+        if (text === day + '\\n' + datePadded ||
+            text === day + '\\n' + dateNum) {
+            // 비활성 상태 체크 (부모 포함)
+            var disabled = item.disabled || item.className.includes('disabled');
+            var parent = item.parentElement;
+            for (var j = 0; j < 3 && parent && !disabled; j++) {
+                if (parent.disabled || parent.className.includes('disabled')) disabled = true;
+                var style = window.getComputedStyle(parent);
+                if (parseFloat(style.opacity) < 0.5 || style.pointerEvents === 'none') disabled = true;
+                parent = parent.parentElement;
+            }
+            var myStyle = window.getComputedStyle(item);
+            if (parseFloat(myStyle.opacity) < 0.5 || myStyle.pointerEvents === 'none') disabled = true;
+
+            if (!disabled) {
+                item.click();
+                return {clicked: true, text: text, top: rect.top};
+            } else {
+                return {clicked: false, disabled: true};
+            }
+        }
+    }
+    return {clicked: false, notFound: true};
+}"""
+
+# 상영 시간표에서 영화별 무대인사/GV/시네마톡 추출
+SCHEDULE_EVENTS_JS = """() => {""" + CGV_CLASSIFIER_JS + """
+    var results = [];
+    var movieSections = document.querySelectorAll('[class*="movie"], [class*="Movie"], .time-table-wrap, .sect-showtimes');
+
+    if (movieSections.length === 0) {
+        movieSections = document.querySelectorAll('body > div');
+    }
+
+    var bodyText = document.body.innerText;
+    var lines = bodyText.split('\\n');
+    var currentMovie = '';
+    var currentTimes = [];
+    var inTimeSection = false;
+
+    for (var i = 0; i < lines.length; i++) {
+        var line = lines[i].trim();
+
+        // Skip empty lines and common UI elements
+        if (!line || line.length < 2) continue;
+        if (/^(전체|오전|오후|18시|심야|영화순|시간순|예매|CGV|2D|3D|IMAX|Laser|관$)/.test(line)) continue;
+
+        // Detect movie title (Korean text, not time, not seat info)
+        var excludeWords = /^(더빙|자막|조조|매진|마감|예매종료|잔여|좌석|개봉|전체|오전|오후|심야|영화순|시간순|예매|일반|특별관|필름|디지털|재개봉|재상영|N차상영|기획전|영화제|시사회|쿠키|스페셜|한정|단독|독점|라이브뷰잉|응원상영|싱어롱|절찬|대개봉|개봉작|상영작|상영중|상영예정|CGV|2D|3D|IMAX|Laser|\\d+관|DOLBY|ATMOS|SCREENX|4DX|리클라이너|아트하우스)$/;
+        if (/^[가-힣]/.test(line) && !/^\\d/.test(line) && !/석$/.test(line) && !/(무대인사|시네마톡|GV)/.test(line) && line.length >= 2 && line.length <= 30) {
+            if (!excludeWords.test(line)) {
+                // Save previous movie if it had events
+                if (currentMovie && currentTimes.length > 0) {
+                    for (var t = 0; t < currentTimes.length; t++) {
+                        results.push({movie: currentMovie, time: currentTimes[t].time, eventType: currentTimes[t].eventType});
+                    }
+                }
+                currentMovie = line;
+                currentTimes = [];
+            }
+        }
+
+        // Detect time with event tag (e.g., "14:30" followed by "무대인사")
+        var timeMatch = line.match(/^(\\d{1,2}:\\d{2})/);
+        if (timeMatch && currentMovie) {
+            var timeStr = timeMatch[1];
+            // Check next few lines for event tags
+            var hasEvent = false;
+            var eventType = '';
+            for (var j = i; j < Math.min(i + 5, lines.length); j++) {
+                var checkLine = lines[j];
+                var tag = cgvEventType(checkLine);
+                if (tag) {
+                    hasEvent = true;
+                    eventType = tag;
+                    break;
+                }
+                // GV 감지 비활성화 - CGV 페이지에서 오탐지가 너무 많음 (event_classifier.CGV_EVENT_TAGS)
+                // Stop if we hit another time or movie
+                if (j > i && /^\\d{1,2}:\\d{2}/.test(lines[j])) break;
+            }
+            if (hasEvent) {
+                currentTimes.push({time: timeStr, eventType: eventType});
+            }
+        }
+    }
+
+    // Don't forget last movie
+    if (currentMovie && currentTimes.length > 0) {
+        for (var t = 0; t < currentTimes.length; t++) {
+            results.push({movie: currentMovie, time: currentTimes[t].time, eventType: currentTimes[t].eventType});
+        }
+    }
+
+    return results;
+}"""
+
+# DOM 변경이 quiet ms 동안 없을 때까지 대기 (최대 timeout ms, 잠잠해졌으면 true)
+DOM_SETTLED_JS = """(args) => new Promise(resolve => {
+    var quietTimer = null;
+    var limitTimer = null;
+    var observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => done(true), args.quiet);
+    });
+    function done(settled) {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(limitTimer);
+        resolve(settled);
+    }
+    observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+    quietTimer = setTimeout(() => done(true), args.quiet);
+    limitTimer = setTimeout(() => done(false), args.timeout);
+})"""
+
+# 날짜 영역 상단의 ">" 버튼 클릭 (다음 날짜 범위)
+NEXT_DATES_JS = """() => {
+    const arrows = document.querySelectorAll('button, a, div, span');
+    for (const el of arrows) {
+        const text = (el.innerText || '').trim();
+        const rect = el.getBoundingClientRect();
+        if (rect.top < 300 && rect.top > 0 && (text === '>' || text === String.fromCharCode(8250))) {
+            el.click();
+            return true;
+        }
+    }
+    return false;
+}"""
+
+
+def resolve_month(date_num):
+    """캘린더의 일(day)이 속한 (연, 월) - 오늘보다 작으면 다음 달"""
+    today = datetime.now()
+    if int(date_num) >= today.day:
+        return today.year, today.month
+    if today.month == 12:
+        return today.year + 1, 1
+    return today.year, today.month + 1
+
+
+def is_tracker(url):
+    host = urlparse(url).hostname or ""
+    return any(host == domain or host.endswith("." + domain) for domain in TRACKER_DOMAINS)
+
+
+async def block_resources(context, blocked):
+    """이미지/동영상/폰트/추적기 요청 중단 (종류별 차단 수를 blocked에 기록)"""
+
+    async def handle(route):
+        request = route.request
+        if not any(allowed in request.url for allowed in BLOCK_ALLOWLIST):
+            if request.resource_type in BLOCKED_RESOURCE_TYPES:
+                blocked[request.resource_type] += 1
+                await route.abort()
+                return
+            if is_tracker(request.url):
+                blocked["tracker"] += 1
+                await route.abort()
+                return
+        await route.fallback()
+
+    await context.route("**/*", handle)
+
+
+async def new_context(browser, stealth, blocked):
+    """스텔스 설정된 격리 컨텍스트 (리소스 차단 포함)"""
+    context = await browser.new_context(user_agent=USER_AGENT, viewport=VIEWPORT)
+    await stealth.apply_stealth_async(context)
+    if BLOCK_RESOURCES:
+        await block_resources(context, blocked)
+    return context
+
+
+class StepTimings:
+    """단계별 대기 시간 누적 (조회가 끝나면 기존 고정 대기 시간과 비교해서 출력)"""
+
+    def __init__(self):
+        self.totals = Counter()
+        self.counts = Counter()
+
+    def record(self, step, elapsed):
+        self.totals[step] += elapsed
+        self.counts[step] += 1
+
+    def log_summary(self):
+        saved = 0.0
+        for step, total in self.totals.items():
+            count = self.counts[step]
+            fixed = FIXED_WAITS.get(step, 0) * count
+            saved += fixed - total
+            print(f"  {step}: {count}회, 평균 {total / count:.2f}초 (고정 대기였다면 {fixed:.1f}초 → {total:.1f}초)")
+        print(f"[{datetime.now()}] 대기 시간 절약: {saved:.1f}초 (컨텍스트 합계)")
+
+
+class PageWaiter:
+    """페이지의 진행 중인 XHR/fetch 요청을 추적해서 조건이 맞을 때까지만 대기"""
+
+    def __init__(self, page, timings):
+        self.page = page
+        self.timings = timings
+        self.pending = set()
+        self.idle = asyncio.Event()
+        self.idle.set()
+        page.on("request", self._started)
+        page.on("requestfinished", self._finished)
+        page.on("requestfailed", self._finished)
+
+    def _started(self, request):
+        if request.resource_type in ("xhr", "fetch"):
+            self.pending.add(request)
+            self.idle.clear()
+
+    def _finished(self, request):
+        self.pending.discard(request)
+        if not self.pending:
+            self.idle.set()
+
+    async def _dom_settled(self, deadline):
+        remaining = int((deadline - time.monotonic()) * 1000)
+        if remaining > 0:
+            try:
+                await self.page.evaluate(DOM_SETTLED_JS, {"quiet": SETTLE_QUIET_MS, "timeout": remaining})
+            except Exception:
+                # 대기 중 페이지 이동 등으로 실행 컨텍스트가 사라짐 - 다음 조건으로 넘어감
+                pass
+
+    async def settle(self, step, timeout=SETTLE_TIMEOUT_MS):
+        """DOM 변경이 잠잠해지고, 진행 중인 XHR이 끝나고, 로딩 오버레이가 사라질 때까지 대기"""
+        start = time.monotonic()
+        deadline = start + timeout / 1000
+
+        # 클릭 직후 요청이 시작될 시간도 여기서 확보됨
+        await self._dom_settled(deadline)
+        if self.pending:
+            try:
+                await asyncio.wait_for(self.idle.wait(), max(0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+            # 응답으로 화면이 다시 그려질 때까지
+            await self._dom_settled(deadline)
+
+        try:
+            await self.page.wait_for_selector(
+                LOADING_SELECTOR, state="hidden", timeout=max(1, int((deadline - time.monotonic()) * 1000))
+            )
+        except Exception:
+            pass
+
+        self.timings.record(step, time.monotonic() - start)
+
+
+class ScheduleCapture:
+    """페이지가 받은 JSON 응답 모으기 (날짜를 누르기 전에 clear)
+
+    시간표 응답을 받은 요청은 극장별 HTTP 조회 템플릿으로 templates에 기록합니다.
+    """
+
+    def __init__(self, page):
+        self.responses = []
+        self.templates = {}
+        self._reads = []
+        if CAPTURE_SCHEDULE_API:
+            page.on("response", self._received)
+
+    def _received(self, response):
+        if response.request.resource_type not in ("xhr", "fetch"):
+            return
+        if "json" not in response.headers.get("content-type", "") or not SCHEDULE_API_PATTERN.search(response.url):
+            return
+        # 늦게 도착한 이전 날짜 응답이 섞이지 않도록 지금의 목록에 담음
+        self._reads.append(asyncio.ensure_future(self._read(response, self.responses)))
+
+    @staticmethod
+    async def _read(response, responses):
+        try:
+            responses.append((response.request, await response.json()))
+        except Exception:
+            pass
+
+    def clear(self):
+        self.responses = []
+        self._reads = []
+
+    @staticmethod
+    def _request_date(request, play_date):
+        """요청 URL/본문에 play_date가 들어 있으면 play_date (상영일 없는 행에 적용)"""
+        return play_date if date_format_of(request.url + (request.post_data or ""), play_date) else None
+
+    async def events(self, play_date, theater=""):
+        """모은 응답에서 play_date의 이벤트 상영 - 시간표 응답이 없었으면 None"""
+        if self._reads:
+            await asyncio.gather(*self._reads)
+        if not self.responses:
+            if CAPTURE_SCHEDULE_API:
+                print(f"  [{theater}] 가로챈 시간표 응답 없음 (CGV_SCHEDULE_API 확인) - 화면 파싱")
+            return None
+
+        found = False
+        events = []
+        seen = set()
+        for request, payload in self.responses:
+            payload_found, payload_events = schedule_events([payload], play_date, self._request_date(request, play_date))
+            found = found or payload_found
+            for event in payload_events:
+                if (event["movie"], event["time"]) not in seen:
+                    seen.add((event["movie"], event["time"]))
+                    events.append(event)
+        if not found:
+            report_unparsed([payload for _, payload in self.responses], play_date, f"브라우저 {theater}")
+            return None
+        return events
+
+    async def remember(self, theater, play_date):
+        """play_date 시간표 응답을 받은 요청을 극장의 HTTP 조회 템플릿으로 기록"""
+        if theater in self.templates:
+            return
+        for request, payload in self.responses:
+            if schedule_events([payload], play_date, self._request_date(request, play_date))[0]:
+                template = make_template(request.method, request.url, await request.all_headers(),
+                                         request.post_data, play_date)
+                if template:
+                    self.templates[theater] = template
+                    return
+
+
+async def open_booking_page(page, waiter):
+    """예매 페이지 이동 (Cloudflare 확인 페이지면 통과될 때까지 대기)"""
+    await page.goto(CGV_URL, timeout=60000, wait_until="domcontentloaded")
+
+    timeout = 10000
+    if "Cloudflare" in await page.title() or "Attention" in await page.title():
+        print("  Cloudflare 감지 - 대기 중...")
+        timeout = 30000
+
+    await page.wait_for_selector("text=극장을 선택해 주세요", timeout=timeout)
+    await waiter.settle("페이지 로드")
+
+
+async def select_theater(page, waiter, region, theater):
+    """극장 선택 팝업에서 지역 > 극장 선택"""
+    try:
+        await page.click("text=극장을 선택해 주세요", timeout=2000)
+    except Exception:
+        # 이미 극장이 선택된 상태 - 페이지 새로고침 후 다시 시도
+        await page.goto(CGV_URL, timeout=60000, wait_until="domcontentloaded")
+        await page.wait_for_selector("text=극장을 선택해 주세요", timeout=10000)
+        await waiter.settle("페이지 새로고침")
+        await page.click("text=극장을 선택해 주세요", timeout=5000)
+    await waiter.settle("극장 선택 팝업")
+
+    await page.click(f"text=/{region}\\(\\d+\\)/", timeout=5000)
+    await waiter.settle("지역 선택")
+
+    await page.click(f"text={theater}", timeout=5000)
+    await waiter.settle("극장 클릭")
+
+    await page.evaluate(CLICK_THEATER_BUTTON_JS)
+    # 날짜 캘린더가 로드될 때까지 대기
+    await waiter.settle("날짜 캘린더 로드")
+
+
+async def click_date(page, day, date_num, log):
+    """날짜 탭 클릭 - 클릭했으면 True (비활성/못 찾음이면 False)"""
+    date_padded = date_num.zfill(2)
+    patterns = [
+        f"text=/{day}\\n{date_padded}$/",
+        f"text=/{day}\\n{date_num}$/",
+        f"text=/{day}.*{date_padded}/",
+        f"text=/{day}.*{date_num}/"
+    ]
+    args = {"day": day, "dateNum": date_num, "datePadded": date_padded}
+
+    # 먼저 날짜 요소를 화면에 스크롤 (behavior: instant라 바로 반영됨)
+    await page.evaluate(SCROLL_TO_DATE_JS, args)
+
+    for pattern in patterns:
+        try:
+            locator = page.locator(pattern).first
+            if await locator.is_visible(timeout=1000):
+                if await locator.evaluate(DATE_DISABLED_JS):
+                    # 비활성 날짜는 스킵 (JS 클릭 시도하지 않음)
+                    log(f"날짜 스킵(비활성): {day} {date_num}")
+                    return False
+                await locator.click(timeout=3000)
+                log(f"날짜 클릭: {day} {date_num}")
+                return True
+        except Exception:
+            pass
+
+    js_click = await page.evaluate(CLICK_DATE_JS, args)
+    if js_click.get("clicked"):
+        log(f"날짜 클릭(JS): {day} {date_num}")
+        return True
+    if js_click.get("disabled"):
+        log(f"날짜 스킵(비활성): {day} {date_num}")
+    else:
+        log(f"날짜 스킵: {day} {date_num}")
+    return False
+
+
+async def scan_date(page, waiter, capture, theater, day, date_num, log):
+    """선택된 날짜의 상영 시간표에서 이벤트 목록 추출 (시간표 응답 우선, 없으면 화면 텍스트)"""
+    year, month = resolve_month(date_num)
+    play_day = date(year, month, int(date_num))
+    play_date = play_day.isoformat()
+
+    movie_events = await capture.events(play_date, theater)
+    source = "API"
+    if movie_events is not None:
+        await capture.remember(theater, play_date)
+    else:
+        # 페이지 끝까지 스크롤해서 나머지 영화 로드 (innerText는 스크롤 위치와 무관)
+        await page.evaluate("() => { window.scrollTo(0, document.body.scrollHeight); }")
+        await waiter.settle("스크롤 로드")
+        await page.evaluate("() => { window.scrollTo(0, 0); }")
+        movie_events = await page.evaluate(SCHEDULE_EVENTS_JS)
+        source = "화면"
+
+    if not movie_events:
+        log(f"{day}요일 {date_num}일 이벤트 없음 ({source})")
+        return []
+
+    log(f"★ {day}요일 {date_num}일 이벤트 발견: {len(movie_events)}건 ({source})")
+    for event in movie_events:
+        log(f"  - [{event.get('eventType', '무대인사')}] {event.get('movie', '미정')} {event.get('time', '')}")
+    return build_greetings(theater, play_day, movie_events)
+
+
+async def scan_theater(page, waiter, capture, region, theater, max_arrow_clicks=10):
+    """극장 하나의 주말 날짜를 모두 확인 (화살표 클릭으로 날짜 범위 확장)"""
+
+    def log(message):
+        print(f"  [{theater}] {message}")
+
+    print(f"[{region} > {theater}] 확인 중...")
+    greetings = []
+
+    try:
+        await select_theater(page, waiter, region, theater)
+        log("극장 선택 완료")
+
+        checked_dates = set()
+        arrow_clicks = 0
+
+        while arrow_clicks <= max_arrow_clicks:
+            # 중복 제거 및 정렬
+            weekend_dates = {f"{d['day']}_{d['date']}": d for d in await page.evaluate(WEEKEND_DATES_JS)}
+            weekend_dates = sorted(weekend_dates.values(), key=lambda x: int(x['date']))
+            log(f"발견된 주말: {[d['day'] + d['date'] for d in weekend_dates]}")
+
+            # 새로운 주말 날짜가 없으면 종료
+            new_dates = [d for d in weekend_dates if f"{d['day']}_{d['date']}" not in checked_dates]
+            if not new_dates and (arrow_clicks or weekend_dates):
+                log("더 이상 새로운 주말 날짜 없음 → 다음 극장")
+                break
+
+            for date_info in new_dates:
+                day, date_num = date_info["day"], date_info["date"]
+                checked_dates.add(f"{day}_{date_num}")
+                try:
+                    capture.clear()
+                    if not await click_date(page, day, date_num, log):
+                        continue
+                    await waiter.settle("날짜 선택")
+                    greetings.extend(await scan_date(page, waiter, capture, theater, day, date_num, log))
+                except Exception as e:
+                    log(f"{day}요일 {date_num}일 오류: {e}")
+
+            if not await page.evaluate(NEXT_DATES_JS):
+                log("화살표 버튼 없음 → 다음 극장")
+                break
+
+            arrow_clicks += 1
+            log(f"→ 다음 날짜 범위로 이동 ({arrow_clicks})")
+            await waiter.settle("날짜 범위 이동")
+
+    except Exception as e:
+        log(f"오류: {e}")
+        # 디버그 스크린샷 저장
+        try:
+            await page.screenshot(path=f"debug_screenshot_{theater}.png")
+            log("디버그 스크린샷 저장됨")
+        except Exception:
+            pass
+
+    return greetings
+
+
+async def _scan_worker(browser, stealth, blocked, timings, templates, queue, results):
+    """컨텍스트 하나에서 대기열의 극장을 차례로 조회 (페이지는 극장 간 재사용)
+
+    끝나면 기록한 시간표 요청에 이 컨텍스트의 쿠키를 붙여 templates에 모읍니다.
+    """
+    context = await new_context(browser, stealth, blocked)
+    try:
+        page = await context.new_page()
+        waiter = PageWaiter(page, timings)
+        capture = ScheduleCapture(page)
+        opened = False
+        while not queue.empty():
+            index, (region, theater) = queue.get_nowait()
+            if not opened:
+                opened = True
+                try:
+                    await open_booking_page(page, waiter)
+                except Exception as e:
+                    print(f"  [{theater}] 페이지 로드 오류: {e}")
+            results[index] = await scan_theater(page, waiter, capture, region, theater)
+        if capture.templates:
+            cookies = cookie_records(await context.cookies())
+            for template in capture.templates.values():
+                template["cookies"] = cookies
+            templates.update(capture.templates)
+    finally:
+        await context.close()
+
+
+class CgvBrowser:
+    """Chromium 하나 + 조회마다 새로 여는 격리 컨텍스트 (상주 모드에서 브라우저 재사용)"""
+
+    def __init__(self, contexts=CGV_CONTEXTS, headless=True):
+        self.contexts = max(1, contexts)
+        self.headless = headless
+        self.stealth = Stealth()
+        self._playwright = None
+        self.browser = None
+        # 마지막 조회에서 기록한 극장별 시간표 요청/쿠키 (cgv_http.CgvHttpClient.update용)
+        self.templates = {}
+
+    async def start(self):
+        self._playwright = await async_playwright().start()
+        await self.launch()
+        return self
+
+    async def launch(self):
+        self.browser = await self._playwright.chromium.launch(
+            headless=self.headless,
+            args=[
+                '--disable-blink-features=AutomationControlled',
+                '--disable-dev-shm-usage',
+                '--no-sandbox'
+            ]
+        )
+
+    async def restart(self):
+        """장시간 실행 시 Chromium 메모리 증가 방지/오류 복구용 재시작"""
+        try:
+            await self.browser.close()
+        except Exception:
+            pass
+        await self.launch()
+
+    async def scan(self, theaters):
+        """극장들을 컨텍스트 CGV_CONTEXTS개로 나눠 동시에 조회 - 중복 제거된 이벤트 목록 반환"""
+        queue = asyncio.Queue()
+        for item in enumerate(theaters):
+            queue.put_nowait(item)
+        results = [[] for _ in theaters]
+
+        blocked = Counter()
+        timings = StepTimings()
+        templates = {}
+
+        workers = min(self.contexts, len(theaters))
+        print(f"[{datetime.now()}] CGV 극장 {len(theaters)}곳 조회 (컨텍스트 {workers}개)")
+        await asyncio.gather(*(
+            _scan_worker(self.browser, self.stealth, blocked, timings, templates, queue, results) for _ in range(workers)
+        ))
+        if blocked:
+            print(f"[{datetime.now()}] 차단한 요청: " + ", ".join(f"{kind} {count}건" for kind, count in blocked.most_common()))
+        if timings.counts:
+            print(f"[{datetime.now()}] 단계별 대기 시간:")
+            timings.log_summary()
+        self.templates = templates
+
+        # 극장 순서대로 합치면서 중복 제거
+        all_greetings = []
+        seen_ids = set()
+        for greetings in results:
+            for g in greetings:
+                if g["id"] not in seen_ids:
+                    seen_ids.add(g["id"])
+                    all_greetings.append(g)
+        return all_greetings
+
+    async def close(self):
+        if self.browser is not None:
+            try:
+                await self.browser.close()
+            except Exception:
+                pass
+            self.browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+async def scan_once(theaters, contexts=CGV_CONTEXTS, headless=True, http_client=None):
+    """브라우저를 띄워 한 번 조회하고 종료 (http_client가 있으면 기록한 요청/쿠키로 세션 갱신)"""
+    browser = await CgvBrowser(contexts, headless).start()
+    try:
+        greetings = await browser.scan(theaters)
+    finally:
+        await browser.close()
+    if http_client is not None:
+        http_client.update(browser.templates)
+    return greetings
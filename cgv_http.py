@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+CGV 상영 시간표 HTTP 직접 조회
+브라우저 조회 중 시간표 응답을 받은 요청(극장별 URL/헤더/본문)을 그 요청을 보낸
+컨텍스트의 쿠키와 함께 세션 파일에 저장해 두고, 다음 실행부터는 날짜만 바꿔
+requests로 바로 요청합니다. 토큰 헤더와 쿠키가 짝이 맞아야 하므로 쿠키는 극장
+요청마다 따로 보냅니다.
+요청이 실패하거나(401/403, JSON이 아닌 확인 페이지 등) 기록이 없는 극장만
+브라우저로 조회하고, 그때 받은 요청/쿠키로 세션을 갱신합니다.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.cookies import RequestsCookieJar
+
+from cgv_schedule import build_greetings, report_unparsed, schedule_events
+from concurrency import RETRY_ATTEMPTS, RetryableError, backoff_delay, check_status
+from event_store import atomic_write
+from http_session import create_session
+
+# HTTP 직접 조회 사용 여부 (0이면 항상 브라우저로 조회)
+DIRECT_HTTP = os.environ.get("CGV_HTTP", "1") != "0"
+
+# 요청/쿠키 저장 파일
+SESSION_FILE = os.environ.get("CGV_SESSION_FILE", "cgv_session.json")
+
+# 오늘부터 며칠 뒤까지의 주말을 조회할지
+HTTP_DAYS = int(os.environ.get("CGV_HTTP_DAYS", "21"))
+
+# 동시에 조회할 극장 수
+HTTP_WORKERS = 8
+
+# 요청 본문 형식에 따라 달라지는 헤더는 저장하지 않음
+# accept-encoding은 브라우저 값(br, zstd 포함)을 그대로 보내면 requests가 풀 수 없는
+# 압축으로 응답이 올 수 있으므로 requests 기본값(gzip, deflate)을 사용
+SKIP_HEADERS = {"cookie", "content-length", "host", "connection", "accept-encoding"}
+
+# 요청 안의 상영일 표기 후보
+DATE_FORMATS = ("%Y%m%d", "%Y-%m-%d", "%Y.%m.%d")
+
+
+def date_format_of(text, play_date):
+    """요청 URL/본문에 play_date("YYYY-MM-DD")가 들어간 형식 (없으면 None)"""
+    day = date.fromisoformat(play_date)
+    for fmt in DATE_FORMATS:
+        if day.strftime(fmt) in text:
+            return fmt
+    return None
+
+
+def make_template(method, url, headers, body, play_date):
+    """날짜만 바꿔 다시 보낼 수 있는 요청 기록 (요청에 상영일이 없으면 None)"""
+    fmt = date_format_of(url + (body or ""), play_date)
+    if fmt is None:
+        return None
+    return {
+        "method": method,
+        "url": url,
+        "headers": {k: v for k, v in headers.items() if k.lower() not in SKIP_HEADERS and not k.startswith(":")},
+        "body": body,
+        "date": date.fromisoformat(play_date).strftime(fmt),
+        "date_format": fmt,
+    }
+
+
+def cookie_records(cookies):
+    """브라우저 컨텍스트 쿠키에서 다시 보낼 때 필요한 값만 남김"""
+    return [
+        {"name": c["name"], "value": c["value"], "domain": c.get("domain", ""), "path": c.get("path", "/")}
+        for c in cookies
+    ]
+
+
+def cookie_jar(template):
+    """템플릿을 기록한 컨텍스트의 쿠키만 담은 쿠키 저장소"""
+    jar = RequestsCookieJar()
+    for cookie in template.get("cookies", []):
+        jar.set(cookie["name"], cookie["value"], domain=cookie["domain"], path=cookie["path"])
+    return jar
+
+
+def weekend_dates(days=HTTP_DAYS, today=None):
+    """오늘부터 days일 뒤까지의 토/일"""
+    today = today or date.today()
+    return [d for d in (today + timedelta(n) for n in range(days + 1)) if d.weekday() >= 5]
+
+
+class CgvHttpClient:
+    """저장된 요청/쿠키로 CGV 시간표 직접 조회 (극장마다 기록한 컨텍스트의 쿠키로 요청)"""
+
+    def __init__(self, path=SESSION_FILE, days=HTTP_DAYS):
+        self.path = path
+        self.days = days
+        self.templates = {}
+        self.saved_at = None
+        self.session = None
+
+    def load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.templates = data.get("templates", {})
+                self.saved_at = data.get("saved_at")
+            except (OSError, ValueError) as e:
+                print(f"[{datetime.now()}] CGV 세션 로드 실패 (무시): {e}")
+        self._reset_session()
+        return self
+
+    def _reset_session(self):
+        self.session = create_session(pool_size=HTTP_WORKERS)
+        # 응답 쿠키가 세션에 쌓여 다른 극장 요청에 섞이지 않도록 세션 쿠키 저장소는 비워 둠
+        self.session.cookies = RequestsCookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+    def save(self):
+        atomic_write(self.path, json.dumps({
+            "saved_at": self.saved_at,
+            "templates": self.templates,
+        }, ensure_ascii=False, indent=2))
+
+    def update(self, templates):
+        """브라우저 조회에서 기록한 요청(쿠키 포함)으로 세션 갱신"""
+        if not templates:
+            return
+        self.templates.update(templates)
+        self.saved_at = datetime.now().isoformat()
+        self._reset_session()
+        self.save()
+        print(f"[{datetime.now()}] CGV 세션 갱신 (요청 기록 {len(self.templates)}곳)")
+
+    def _fetch(self, template, jar, day):
+        """템플릿의 상영일을 day로 바꿔 jar의 쿠키로 요청 - JSON 응답 (실패하면 None)"""
+        value = day.strftime(template["date_format"])
+        url = template["url"].replace(template["date"], value)
+        body = template["body"].replace(template["date"], value) if template["body"] else None
+
+        for attempt in range(RETRY_ATTEMPTS):
+            if attempt:
+                time.sleep(backoff_delay(attempt))
+            try:
+                response = self.session.request(
+                    template["method"], url, headers=template["headers"], cookies=jar,
+                    data=body.encode("utf-8") if body else None, timeout=10,
+                )
+                check_status(response.status_code)
+                if response.status_code != 200:
+                    # 401/403 등 - 쿠키/토큰 만료
+                    return None
+                payload = response.json()
+                # 응답에서 갱신된 쿠키는 같은 극장의 다음 요청에만 이어 씀
+                jar.update(response.cookies)
+                return payload
+            except (requests.RequestException, RetryableError):
+                continue
+            except ValueError:
+                # JSON이 아님 (봇 확인 페이지 등)
+                return None
+        return None
+
+    def scan_theater(self, theater, dates):
+        """극장 하나의 주말 이벤트 (요청 실패 또는 시간표를 못 찾으면 None)
+
+        200 응답이어도 상영 행을 못 찾은 날짜는 실패로 봅니다. 다만 시간표는 가까운
+        날짜부터 열리므로, 상영 행이 있는 마지막 날짜 뒤의 날짜는 아직 열리지 않은 것으로
+        보고 이벤트 없음으로 처리합니다.
+        """
+        template = self.templates.get(theater)
+        if template is None:
+            return None
+
+        jar = cookie_jar(template)
+        results = []
+        for day in dates:
+            payload = self._fetch(template, jar, day)
+            if payload is None:
+                return None
+            results.append((day, payload) + schedule_events([payload], day.isoformat(), day.isoformat()))
+
+        last_open = max((i for i, (_, _, found, _) in enumerate(results) if found), default=len(results) - 1)
+        unparsed = [(day, payload) for day, payload, found, _ in results[:last_open + 1] if not found]
+        if unparsed:
+            day, payload = unparsed[0]
+            report_unparsed([payload], day.isoformat(), f"HTTP {theater}")
+            return None
+
+        greetings = []
+        for day, _, _, events in results:
+            greetings.extend(build_greetings(theater, day, events))
+        return greetings
+
+    def scan(self, theaters):
+        """(이벤트 목록, 브라우저로 조회해야 할 극장 목록) 반환"""
+        dates = weekend_dates(self.days)
+        start = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=HTTP_WORKERS) as pool:
+            results = list(pool.map(lambda item: self.scan_theater(item[1], dates), theaters))
+
+        greetings = []
+        missing = []
+        for (region, theater), result in zip(theaters, results):
+            if result is None:
+                missing.append((region, theater))
+            else:
+                greetings.extend(result)
+
+        done = len(theaters) - len(missing)
+        print(f"[{datetime.now()}] CGV HTTP 조회: {done}/{len(theaters)}곳, 주말 {len(dates)}일, "
+              f"이벤트 {len(greetings)}건 ({time.monotonic() - start:.1f}초)")
+        return greetings, missing
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+CGV 상영 시간표 JSON 해석
+예매 페이지가 받아오는 상영 시간표 응답(JSON)에서 상영 목록을 뽑습니다.
+응답 구조가 바뀌어도 동작하도록 특정 경로 대신 필드 이름으로 상영 행을 찾고,
+상위 객체의 영화 제목/상영일은 하위 상영 행에 이어받습니다.
+
+필드 이름 후보는 실제 응답으로 확인한 것이 아닙니다. 시간표 응답에서 상영 행을
+못 찾으면 로그를 남기고, CGV_DUMP_DIR이 있으면 응답을 파일로 저장하므로
+(Actions에서는 아티팩트로 업로드) 그 응답을 tests/fixtures에 넣고 후보를 맞춥니다.
+"""
+
+import json
+import os
+import re
+from datetime import date, datetime
+
+from event_classifier import classify_cgv
+from event_store import greeting_play_date
+
+# 상영 행을 못 찾은 응답을 저장할 디렉터리 (비어 있으면 저장 안 함)
+DUMP_DIR = os.environ.get("CGV_DUMP_DIR", "")
+
+# 필드 이름 후보 (대소문자 무시)
+MOVIE_KEYS = ("movnm", "movienm", "moviename", "movknm", "movnmkor", "prodnm", "expomovnm")
+TIME_KEYS = ("scnsrttm", "scnstrttm", "scnstttm", "playstarttime", "playstrttm", "starttime", "strttm", "scnsttm")
+DATE_KEYS = ("scnymd", "playymd", "scndy", "playdate", "playde", "scndate")
+
+TIME_PATTERN = re.compile(r"^(\d{1,2}):?(\d{2})(?::?\d{2})?$")
+DATE_PATTERN = re.compile(r"^(\d{4})-?(\d{2})-?(\d{2})")
+
+# ID용 영화 제목 정리: 괄호 안(자막/더빙 등)과 공백/기호 제거
+TITLE_BRACKETS = re.compile(r"\([^)]*\)|\[[^\]]*\]|<[^>]*>")
+TITLE_SYMBOLS = re.compile(r"[^0-9a-z가-힣]")
+
+
+def normalize_time(value):
+    """"1740" / "17:40" / "174000" → "17:40" (시간 형식이 아니면 None)"""
+    match = TIME_PATTERN.match(str(value).strip())
+    if not match:
+        return None
+    return f"{int(match.group(1)):02d}:{match.group(2)}"
+
+
+def normalize_date(value):
+    """"20260207" / "2026-02-07" → "2026-02-07" (날짜 형식이 아니면 None)"""
+    match = DATE_PATTERN.match(str(value).strip())
+    if not match:
+        return None
+    return "-".join(match.groups())
+
+
+def _field(node, keys):
+    for key, value in node.items():
+        if key.lower() in keys and isinstance(value, (str, int)) and str(value).strip():
+            return value
+    return None
+
+
+def iter_showtimes(payload, movie=None, play_date=None):
+    """JSON 안의 상영 행을 {"movie", "time", "date", "text"}로 나열
+
+    text는 상영 행의 문자열 값을 모두 이은 것 (이벤트 태그 판별용)
+    """
+    if isinstance(payload, list):
+        for item in payload:
+            yield from iter_showtimes(item, movie, play_date)
+        return
+    if not isinstance(payload, dict):
+        return
+
+    movie = _field(payload, MOVIE_KEYS) or movie
+    date_value = _field(payload, DATE_KEYS)
+    play_date = (normalize_date(date_value) if date_value is not None else None) or play_date
+
+    time_value = _field(payload, TIME_KEYS)
+    start = normalize_time(time_value) if time_value is not None else None
+    if start and movie:
+        text = " ".join(str(v) for v in payload.values() if isinstance(v, str))
+        yield {"movie": str(movie).strip(), "time": start, "date": play_date, "text": text}
+
+    for value in payload.values():
+        if isinstance(value, (dict, list)):
+            yield from iter_showtimes(value, movie, play_date)
+
+
+def schedule_events(payloads, play_date=None, request_date=None):
+    """응답 목록에서 play_date("YYYY-MM-DD")의 이벤트 상영 추출
+
+    (play_date 상영 행을 하나라도 찾았는지, [{"movie", "time", "eventType"}, ...]) 반환 -
+    상영일이 play_date인 행이 없으면(다른 날짜 응답, 상영일 없는 행뿐) 그 날짜 시간표가
+    아니었던 것이므로 화면 파싱으로 대신합니다. play_date가 없으면 모든 행을 사용합니다.
+    request_date는 응답을 받은 요청에 들어 있던 상영일 - 상영일 필드가 없는 행은 이 날짜로 봅니다.
+    """
+    found = False
+    events = []
+    seen = set()
+    for payload in payloads:
+        for row in iter_showtimes(payload, play_date=request_date):
+            if play_date and row["date"] != play_date:
+                continue
+            found = True
+            event_type = classify_cgv(row["text"]) or classify_cgv(row["movie"])
+            key = (row["movie"], row["time"])
+            if event_type and key not in seen:
+                seen.add(key)
+                events.append({"movie": row["movie"], "time": row["time"], "eventType": event_type})
+    return found, events
+
+
+def _key_paths(payload, prefix="", depth=3):
+    """응답 구조 요약용 필드 경로 ("data[].movNm" 등)"""
+    if isinstance(payload, list):
+        return _key_paths(payload[0], prefix + "[]", depth) if payload else [prefix + "[]"]
+    if not isinstance(payload, dict) or depth == 0:
+        return [prefix] if prefix else []
+    paths = []
+    for key, value in payload.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, (dict, list)):
+            paths.extend(_key_paths(value, path, depth - 1))
+        else:
+            paths.append(path)
+    return paths
+
+
+def report_unparsed(payloads, play_date, source):
+    """시간표 응답에서 play_date 상영 행을 못 찾았을 때 로그 (DUMP_DIR이 있으면 응답 저장)"""
+    rows = [row for payload in payloads for row in iter_showtimes(payload)]
+    if rows:
+        dates = sorted({row["date"] or "상영일 없음" for row in rows})
+        detail = f"상영 행 {len(rows)}개의 상영일: {', '.join(dates)}"
+    else:
+        paths = list(dict.fromkeys(path for payload in payloads for path in _key_paths(payload)))
+        detail = "상영 행을 찾지 못함 - 필드: " + ", ".join(paths[:20]) + (" …" if len(paths) > 20 else "")
+    print(f"[{datetime.now()}] CGV {source} 시간표 응답 {len(payloads)}건에 {play_date} 상영 없음 ({detail})")
+
+    if DUMP_DIR:
+        os.makedirs(DUMP_DIR, exist_ok=True)
+        name = re.sub(r"\W+", "_", source)
+        path = os.path.join(DUMP_DIR, f"{name}_{play_date}_{datetime.now():%H%M%S%f}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payloads, f, ensure_ascii=False, indent=2)
+
+
+WEEKDAY_NAMES = "월화수목금토일"
+
+
+def greeting_id(theater, play_date, time, movie):
+    """상영 하나의 ID (극장_연_월_일_시간_영화)
+
+    시간표 응답과 화면 파싱이 같은 상영에 같은 ID를 만들도록 시간은 HH:MM,
+    영화 제목은 괄호 안과 공백/기호를 뺀 앞 10자로 맞춥니다.
+    """
+    time = normalize_time(time) or str(time).strip()
+    title = TITLE_SYMBOLS.sub("", TITLE_BRACKETS.sub("", str(movie)).lower())[:10]
+    return f"{theater}_{play_date.year}_{play_date.month}_{play_date.day}_{time}_{title}"
+
+
+def greeting_key(greeting):
+    """저장된 이벤트의 중복 확인 키 - 예전 형식 ID로 저장된 이벤트도 greeting_id로 다시 계산"""
+    theater = greeting.get("theater", "")
+    theater = theater[4:] if theater.startswith("CGV ") else theater
+    play_date = greeting_play_date(greeting)
+    if play_date == "9999-99-99":
+        return greeting.get("id", "")
+    return greeting_id(theater, date.fromisoformat(play_date), greeting.get("time", ""), greeting.get("movie", "미정"))
+
+
+def build_greetings(theater, play_date, events):
+    """상영일(date)의 이벤트 상영 목록을 저장/알림용 dict로 변환"""
+    date_str = f"{play_date.month}월 {play_date.day}일 ({WEEKDAY_NAMES[play_date.weekday()]})"
+    return [{
+        "movie": event.get("movie", "미정"),
+        "theater": f"CGV {theater}",
+        "date": date_str,
+        "time": normalize_time(event.get("time", "")) or event.get("time", ""),
+        "hall": "",
+        "event_type": event.get("eventType", "무대인사"),
+        "playDate": play_date.isoformat(),
+        "id": greeting_id(theater, play_date, event.get("time", ""), event.get("movie", "미정")),
+    } for event in events]
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+체인별 적응형 동시 요청 제어 (AIMD) 및 재시도
+응답이 빠르고 정상이면 동시 요청 수를 조금씩 늘리고, 타임아웃/5xx/비JSON 응답이
+오면 절반으로 줄입니다. 실패한 요청은 지터를 준 지수 백오프로 재시도합니다.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+# 동시 요청 수 범위
+INITIAL_LIMIT = 10
+MIN_LIMIT = 2
+
+# 이 시간(초)보다 느린 응답은 성공이어도 동시 요청 수를 늘리지 않음
+LATENCY_TARGET = 2.0
+
+# 연속 감소 방지 간격(초) - 같은 혼잡으로 여러 번 줄이지 않도록
+DECREASE_COOLDOWN = 1.0
+
+# 재시도 설정
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5
+
+
+class RetryableError(Exception):
+    """재시도 대상 응답 (429/5xx)"""
+
+
+class AdaptiveLimiter:
+    """AIMD 방식으로 동시 요청 수를 조절하는 제한기"""
+
+    def __init__(self, name, maximum, initial=INITIAL_LIMIT, minimum=MIN_LIMIT,
+                 latency_target=LATENCY_TARGET):
+        self.name = name
+        self.maximum = maximum
+        self.minimum = minimum
+        self.latency_target = latency_target
+        self.limit = float(min(initial, maximum))
+        self.in_flight = 0
+        self.successes = 0
+        self.failures = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def record(self, ok, latency):
+        """요청 결과 반영 (AIMD)"""
+        with self._cond:
+            if ok:
+                self.successes += 1
+                if latency <= self.latency_target:
+                    # 현재 한도만큼 성공하면 +1 (additive increase)
+                    self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            else:
+                self.failures += 1
+                now = time.monotonic()
+                if now - self._last_decrease >= DECREASE_COOLDOWN:
+                    # multiplicative decrease
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self._last_decrease = now
+            self._cond.notify_all()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, ok, latency):
+        with self._cond:
+            self.in_flight -= 1
+        self.record(ok, latency)
+
+    def summary(self):
+        return f"{self.name} 동시 요청 한도 {int(self.limit)} (성공 {self.successes}, 실패 {self.failures})"
+
+
+def backoff_delay(attempt, base=RETRY_BASE_DELAY):
+    """지수 백오프 + full jitter"""
+    return random.uniform(0, base * (2 ** attempt))
+
+
+def check_status(status_code):
+    """스로틀링/서버 오류는 재시도 대상"""
+    if status_code == 429 or status_code >= 500:
+        raise RetryableError(f"HTTP {status_code}")
+
+
+def post_json(session, limiter, url, decode=None, attempts=RETRY_ATTEMPTS, **kwargs):
+    """제한기를 거쳐 POST 후 JSON 응답 반환 (실패 시 재시도)
+
+    decode가 있으면 응답 바이트를 decode(content)로 변환한 결과를 반환합니다.
+    타임아웃/연결 오류, 429/5xx, JSON이 아닌 응답은 실패로 기록하고
+    재시도합니다. 모든 시도가 실패하면 마지막 예외를 던집니다.
+    """
+    error = None
+
+    for attempt in range(attempts):
+        if attempt:
+            time.sleep(backoff_delay(attempt))
+
+        limiter.acquire()
+        start = time.monotonic()
+        ok = False
+        try:
+            response = session.post(url, **kwargs)
+            check_status(response.status_code)
+            result = decode(response.content) if decode else response.json()
+            ok = True
+            return result
+        except (requests.RequestException, RetryableError, ValueError) as e:
+            error = e
+        finally:
+            limiter.release(ok, time.monotonic() - start)
+
+    raise error
+
+
+def log_summary(limiter):
+    print(f"[{datetime.now()}] {limiter.summary()}")
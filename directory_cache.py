@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+영화관/지점 목록 캐시
+목록은 거의 바뀌지 않으므로 파일에 저장해두고 TTL이 지나면 백그라운드에서 갱신합니다.
+목록 조회가 실패하면 마지막으로 성공한 목록을 계속 사용합니다.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from event_store import atomic_write
+
+# 목록 유효 기간 (초)
+DIRECTORY_TTL = 7 * 24 * 60 * 60
+
+
+class DirectoryCache:
+    """TTL + 백그라운드 갱신 목록 캐시"""
+
+    def __init__(self, path, fetch, ttl=DIRECTORY_TTL):
+        self.path = path
+        self.fetch = fetch
+        self.ttl = ttl
+        self.items = []
+        self.fetched_at = 0
+        self._loaded = False
+        self._refreshing = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.items = data.get("items", [])
+                self.fetched_at = data.get("fetched_at", 0)
+            except (OSError, ValueError) as e:
+                print(f"[{datetime.now()}] 목록 캐시 로드 실패 (무시): {e}")
+        self._loaded = True
+        return self
+
+    def save(self):
+        atomic_write(self.path, json.dumps({"fetched_at": self.fetched_at, "items": self.items}, ensure_ascii=False))
+
+    def is_stale(self):
+        return time.time() - self.fetched_at > self.ttl
+
+    def refresh(self):
+        """목록 다시 조회 - 실패하면 기존 목록 유지"""
+        items = self.fetch()
+        with self._lock:
+            if items:
+                self.items = items
+                self.fetched_at = time.time()
+                self.save()
+                print(f"[{datetime.now()}] 목록 갱신 완료: {len(items)}개")
+            else:
+                print(f"[{datetime.now()}] 목록 갱신 실패 - 기존 목록 사용 ({len(self.items)}개)")
+            self._refreshing = None
+        return self.items
+
+    def get(self):
+        """목록 반환
+
+        캐시가 없으면 바로 조회하고, TTL이 지났으면 기존 목록을 반환하면서
+        백그라운드에서 갱신합니다.
+        """
+        if not self._loaded:
+            self.load()
+
+        if not self.items:
+            return self.refresh()
+
+        with self._lock:
+            if self.is_stale() and self._refreshing is None:
+                self._refreshing = threading.Thread(target=self.refresh, name="directory-refresh")
+                self._refreshing.start()
+
+        return self.items
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Discord 웹훅 일괄 전송
+웹훅 메시지를 보냅니다 (embed 묶음은 outbox에서 만듦). 고정 sleep 대신 응답의
+X-RateLimit-Remaining / X-RateLimit-Reset-After 헤더로 다음 전송 시점을 정하고,
+429 응답이면 retry_after만큼 기다렸다가 다시 보냅니다.
+"""
+
+import time
+from datetime import datetime
+
+from concurrency import backoff_delay
+
+# Discord 웹훅 메시지 하나에 넣을 수 있는 embed 수
+MAX_EMBEDS_PER_MESSAGE = 10
+
+# 메시지 하나의 embed 글자 수 합계 상한 (제목/설명/필드 이름·값/footer/author)
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+# 메시지 하나당 최대 시도 횟수 (429/5xx/네트워크 오류)
+MAX_ATTEMPTS = 5
+
+# embed 필드 값 최대 길이
+FIELD_VALUE_LIMIT = 1024
+
+
+def field_lines(lines, limit=FIELD_VALUE_LIMIT):
+    """여러 줄을 필드 값 하나로 합치기 (길이 제한을 넘으면 나머지는 "외 N건"으로 줄임)"""
+    value = ""
+    for i, line in enumerate(lines):
+        rest = f"\n… 외 {len(lines) - i}건"
+        candidate = f"{value}\n{line}" if value else line
+        # 뒤에 줄임 표시가 들어갈 자리는 남겨둠
+        if len(candidate) + (len(rest) if i < len(lines) - 1 else 0) > limit:
+            return value + rest
+        value = candidate
+    return value
+
+
+def embed_size(embed):
+    """Discord가 메시지 글자 수 제한에 세는 embed 글자 수"""
+    size = len(embed.get("title", "")) + len(embed.get("description", ""))
+    size += len(embed.get("footer", {}).get("text", "")) + len(embed.get("author", {}).get("name", ""))
+    for field in embed.get("fields", []):
+        size += len(field.get("name", "")) + len(field.get("value", ""))
+    return size
+
+
+def batch_size(embeds, limit=MAX_EMBED_CHARS_PER_MESSAGE):
+    """앞에서부터 메시지 하나에 넣을 수 있는 embed 수 (개수/글자 수 제한, 최소 1)"""
+    total = 0
+    for i, embed in enumerate(embeds[:MAX_EMBEDS_PER_MESSAGE]):
+        total += embed_size(embed)
+        if i and total > limit:
+            return i
+    return min(len(embeds), MAX_EMBEDS_PER_MESSAGE)
+
+
+class DiscordNotifier:
+    """웹훅 URL 하나의 전송기 (rate limit 버킷 상태를 기억)"""
+
+    def __init__(self, session, webhook_url, max_attempts=MAX_ATTEMPTS):
+        self.session = session
+        self.webhook_url = webhook_url
+        self.max_attempts = max_attempts
+        self.remaining = None
+        self.reset_at = 0.0
+        self.last_status = None
+
+    def _wait_for_bucket(self):
+        """남은 요청 수가 0이면 버킷이 초기화될 때까지 대기"""
+        if self.remaining == 0:
+            delay = self.reset_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self.remaining = None
+
+    def _update_bucket(self, response):
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset_after = response.headers.get("X-RateLimit-Reset-After")
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset_after is not None:
+            self.reset_at = time.monotonic() + float(reset_after)
+
+    @staticmethod
+    def _retry_after(response):
+        """429 응답의 대기 시간(초) - 본문 retry_after, 없으면 Retry-After 헤더"""
+        try:
+            return float(response.json()["retry_after"])
+        except (ValueError, KeyError, TypeError):
+            return float(response.headers.get("Retry-After", 1))
+
+    def post(self, payload):
+        """메시지 하나 전송 - 성공(200/204)하면 True"""
+        for attempt in range(self.max_attempts):
+            self._wait_for_bucket()
+            self.last_status = None
+            try:
+                response = self.session.post(self.webhook_url, json=payload, timeout=10)
+            except Exception as e:
+                print(f"[{datetime.now()}] Discord 전송 오류: {e}")
+                time.sleep(backoff_delay(attempt))
+                continue
+
+            self._update_bucket(response)
+            self.last_status = response.status_code
+            if response.status_code in (200, 204):
+                return True
+            if response.status_code == 429:
+                retry_after = self._retry_after(response)
+                print(f"[{datetime.now()}] Discord rate limit - {retry_after:.1f}초 후 재시도")
+                time.sleep(retry_after)
+                continue
+            if response.status_code >= 500:
+                time.sleep(backoff_delay(attempt))
+                continue
+
+            print(f"[{datetime.now()}] 알림 전송 실패: {response.status_code}")
+            return False
+
+        print(f"[{datetime.now()}] 알림 전송 실패: {self.max_attempts}회 시도")
+        return False
+
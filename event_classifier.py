@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+영화관 체인 공용 이벤트 상영 분류기
+롯데시네마(상영 구분 코드), 메가박스(영화 제목 키워드), CGV(시간표 태그)의
+분류 기준을 한 곳에 모으고 import 시 한 번만 컴파일합니다.
+CGV 분류 기준은 page.evaluate에 넣을 JavaScript(CGV_CLASSIFIER_JS)로도 제공합니다.
+"""
+
+import hashlib
+import json
+import re
+
+# ---------------------------------------------------------------------------
+# 롯데시네마: AccompanyTypeCode / AccompanyTypeNameKR
+# ---------------------------------------------------------------------------
+
+# 이벤트 타입 코드 (일반=10 제외)
+LOTTE_EVENT_CODES = {
+    30: "무대인사",
+    40: "GV",
+    50: "시사회",
+    230: "스페셜상영회",
+}
+
+# 코드가 없어도 구분명에 포함되면 이벤트
+LOTTE_NAME_KEYWORDS = ["무대인사", "GV", "시사회", "스페셜"]
+LOTTE_NAME_PATTERN = re.compile("|".join(re.escape(kw) for kw in LOTTE_NAME_KEYWORDS))
+
+
+def classify_lotte(accompany_code, accompany_name):
+    """(이벤트 여부, 이벤트 타입명) 반환"""
+    accompany_name = accompany_name or ""
+    if accompany_code in LOTTE_EVENT_CODES or LOTTE_NAME_PATTERN.search(accompany_name):
+        return True, accompany_name or LOTTE_EVENT_CODES.get(accompany_code, "특별상영")
+    return False, ""
+
+
+# ---------------------------------------------------------------------------
+# 메가박스: 영화 제목 키워드 + eventDivCd
+# ---------------------------------------------------------------------------
+
+MEGABOX_EVENT_KEYWORDS = [
+    "무대인사", "GV", "관객과의대화", "관객과의 대화",
+    "시사회", "라이브뷰잉", "라이브 뷰잉", "LIVE", "Live",
+    "콘서트", "concert", "싱어롱", "sing-along", "응원상영",
+    "큐앤에이", "Q&A", "토크", "굿즈", "특별상영"
+]
+
+
+def build_keyword_matcher(keywords):
+    """키워드 목록으로 한 번에 검사하는 정규식 생성 (소문자 제목에 사용)
+
+    같은 위치에서는 긴 키워드를 먼저 시도합니다. 매칭이 겹치지 않게 진행하므로
+    서로 겹치는 키워드(한 키워드의 끝이 다른 키워드의 시작)는 하나만 잡힙니다.
+    """
+    lowered = sorted({kw.lower() for kw in keywords}, key=len, reverse=True)
+    return re.compile("|".join(re.escape(kw) for kw in lowered))
+
+
+MEGABOX_KEYWORD_PATTERN = build_keyword_matcher(MEGABOX_EVENT_KEYWORDS)
+MEGABOX_KEYWORD_ORDER = [(kw, kw.lower()) for kw in MEGABOX_EVENT_KEYWORDS]
+
+
+def classify_megabox(movie_name, event_div_cd=None):
+    """(이벤트 여부, 매칭된 키워드 목록) 반환"""
+    found = MEGABOX_KEYWORD_PATTERN.findall(movie_name.lower())
+    if not found:
+        return bool(event_div_cd), []
+
+    found = set(found)
+    matched_keywords = [kw for kw, lowered in MEGABOX_KEYWORD_ORDER if lowered in found]
+
+    # 이벤트 코드가 있거나 영화 제목에 이벤트 키워드가 있으면 이벤트 상영
+    return True, matched_keywords
+
+
+# ---------------------------------------------------------------------------
+# CGV: 상영 시간 주변 줄의 태그
+# ---------------------------------------------------------------------------
+
+# 우선순위 순서 (한 줄에 여러 태그가 있으면 앞쪽 태그)
+# GV 감지 비활성화 - CGV 페이지에서 오탐지가 너무 많음
+# 실제 GV 이벤트는 대부분 "시네마톡"이나 "무대인사"로 표시됨
+CGV_EVENT_TAGS = ["무대인사", "시네마톡", "굿즈"]
+CGV_TAG_PATTERN = re.compile("|".join(re.escape(tag) for tag in CGV_EVENT_TAGS))
+
+
+def classify_cgv(line):
+    """시간표 한 줄의 이벤트 태그 반환 (없으면 빈 문자열)"""
+    if not CGV_TAG_PATTERN.search(line):
+        return ""
+    for tag in CGV_EVENT_TAGS:
+        if tag in line:
+            return tag
+    return ""
+
+
+# page.evaluate 스크립트 앞에 붙여서 쓰는 JS 버전 (cgvEventType(line))
+CGV_CLASSIFIER_JS = """
+    var CGV_EVENT_TAGS = %s;
+    var CGV_TAG_RE = new RegExp(CGV_EVENT_TAGS.join('|'));
+    function cgvEventType(line) {
+        if (!CGV_TAG_RE.test(line)) return '';
+        for (var k = 0; k < CGV_EVENT_TAGS.length; k++) {
+            if (line.indexOf(CGV_EVENT_TAGS[k]) !== -1) return CGV_EVENT_TAGS[k];
+        }
+        return '';
+    }
+""" % json.dumps(CGV_EVENT_TAGS, ensure_ascii=False)
+
+
+# 분류 기준이 바뀌면 달라지는 값 (응답 지문 캐시가 예전 기준으로 추출한 이벤트를 재사용하지 않도록)
+CLASSIFIER_VERSION = hashlib.blake2b(json.dumps(
+    [sorted(LOTTE_EVENT_CODES.items()), LOTTE_NAME_KEYWORDS, MEGABOX_EVENT_KEYWORDS, CGV_EVENT_TAGS],
+    ensure_ascii=False,
+).encode("utf-8"), digest_size=8).hexdigest()
+
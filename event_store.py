@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+"""
+저장된 이벤트 저장소
+기본은 기존 JSON 파일(lotte_events.json 등)입니다.
+EVENT_STORE=sqlite이면 이벤트 ID 기본 키와 상영 날짜 인덱스를 가진 SQLite 파일에
+새로 생기거나 바뀐 이벤트만 기록합니다. 오래된 이벤트 정리도 인덱스를 쓰는 DELETE 한 번으로 끝납니다.
+EVENT_STORE=journal이면 JSON 파일을 스냅샷으로 두고 변경분만 JSONL 저널에 덧붙이며,
+저널이 커지면 스냅샷을 다시 씁니다.
+EVENT_FORMAT=packed이면 JSON/저널 저장소의 파일을 압축 형식(<이름>.bin, state_format.py)으로
+저장합니다. .bin 파일이 없으면 기존 JSON 파일에서 가져옵니다.
+EVENT_INDEX=1이면 이벤트 ID 해시(64비트)와 상영일만 담은 <이름>.seen 인덱스로 새 이벤트를
+확인하고, 전체 이벤트는 새 이벤트를 추가하거나 지난 이벤트를 정리할 때만 불러옵니다.
+
+파일은 임시 파일에 쓰고 fsync 후 rename하므로 중간에 종료되어도 잘린 JSON이 남지 않습니다.
+
+변환/정리 (저장소 루트에서):
+    python event_store.py import lotte_events.json lotte_events.db playDate
+    python event_store.py export lotte_events.db lotte_events.json
+    python event_store.py compact lotte_events.json playDate
+    python event_store.py pack lotte_events.json lotte_events.bin
+    python event_store.py unpack lotte_events.bin lotte_events.json
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from array import array
+import sys
+from datetime import datetime, timedelta
+
+from state_format import pack_events, unpack_events
+
+# 저장소 종류: json(기본) / sqlite / journal
+STORE_BACKEND = os.environ.get("EVENT_STORE", "json")
+
+# 파일 형식: json(기본) / packed (json/journal 저장소에 적용)
+STORE_FORMAT = os.environ.get("EVENT_FORMAT", "json")
+
+# 저널이 이 크기(바이트)를 넘으면 스냅샷으로 합침
+JOURNAL_COMPACT_BYTES = int(os.environ.get("JOURNAL_COMPACT_BYTES", str(256 * 1024)))
+
+# SQLite IN (...) 조회 한 번에 넣을 ID 수
+QUERY_CHUNK = 500
+
+# 본 이벤트 ID 인덱스 사용 여부
+SEEN_INDEX = os.environ.get("EVENT_INDEX", "0") == "1"
+
+
+def is_packed(path):
+    return path.endswith(".bin")
+
+
+def load_json_events(path):
+    """이벤트 파일 읽기 ({event_id: event}) - .bin이면 압축 형식"""
+    if not os.path.exists(path):
+        return {}
+    if is_packed(path):
+        with open(path, "rb") as f:
+            return unpack_events(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def atomic_write(path, data):
+    """임시 파일에 쓰고 fsync 후 rename (중간에 종료되어도 기존 파일 유지)"""
+    tmp_path = f"{path}.tmp"
+    if isinstance(data, bytes):
+        f = open(tmp_path, "wb")
+    else:
+        f = open(tmp_path, "w", encoding="utf-8")
+    with f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def dump_json_events(path, events):
+    """이벤트 파일 쓰기 - .bin이면 압축 형식"""
+    if is_packed(path):
+        atomic_write(path, pack_events(events))
+    else:
+        atomic_write(path, json.dumps(events, ensure_ascii=False, indent=2))
+
+
+class JsonEventStore:
+    """{event_id: event} 전체를 JSON 파일 하나에 저장"""
+
+    def __init__(self, path, date_field, import_from=None):
+        self.path = path
+        self.date_field = date_field
+        self.import_from = import_from
+        self.events = {}
+
+    def load(self):
+        # 형식을 바꾼 뒤 처음 실행하면 기존 파일에서 가져오기
+        if not os.path.exists(self.path) and self.import_from and os.path.exists(self.import_from):
+            self.events = load_json_events(self.import_from)
+            print(f"[{datetime.now()}] {self.import_from} → {self.path}: {len(self.events)}개 이벤트 가져옴")
+        else:
+            self.events = load_json_events(self.path)
+        return self
+
+    def __len__(self):
+        return len(self.events)
+
+    def unseen(self, event_ids):
+        """저장되지 않은 이벤트 ID 집합"""
+        return {event_id for event_id in event_ids if event_id not in self.events}
+
+    def upsert(self, events):
+        """이벤트 추가/갱신 - 새로 생기거나 바뀐 이벤트 수 반환"""
+        changed = 0
+        for event_id, event in events.items():
+            if self.events.get(event_id) != event:
+                self._put(event_id, event)
+                changed += 1
+        return changed
+
+    def prune(self, cutoff_date):
+        """cutoff_date 이전 상영 삭제 - 삭제된 수 반환"""
+        stale = [
+            k for k, v in self.events.items()
+            if v.get(self.date_field, "9999-99-99") < cutoff_date
+        ]
+        for event_id in stale:
+            self._delete(event_id)
+        return len(stale)
+
+    def _put(self, event_id, event):
+        self.events[event_id] = event
+
+    def _delete(self, event_id):
+        del self.events[event_id]
+
+    def save(self):
+        dump_json_events(self.path, self.events)
+
+    def export(self):
+        return dict(self.events)
+
+
+class JournalEventStore(JsonEventStore):
+    """JSON 스냅샷 + 변경분 JSONL 저널
+
+    저널 한 줄은 {"put": id, "event": {...}} 또는 {"delete": id}입니다.
+    불러올 때 스냅샷 위에 저널을 순서대로 다시 적용하며, 종료 중에 잘린
+    마지막 줄은 건너뜁니다(그 실행의 변경은 다음 조회에서 다시 기록됨).
+    """
+
+    def __init__(self, path, date_field, import_from=None, compact_bytes=JOURNAL_COMPACT_BYTES):
+        super().__init__(path, date_field, import_from)
+        self.journal_path = os.path.splitext(path)[0] + ".journal.jsonl"
+        self.compact_bytes = compact_bytes
+        self.pending = []
+
+    def load(self):
+        super().load()
+        self.pending = []
+        if not os.path.exists(self.journal_path):
+            return self
+
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            text = f.read()
+        lines = text.splitlines()
+
+        # 줄바꿈으로 끝나지 않으면 마지막 줄은 쓰다 만 것
+        truncated = bool(text) and not text.endswith("\n")
+        if truncated:
+            print(f"[{datetime.now()}] 저널 마지막 줄이 잘려 있어 건너뜁니다.")
+            lines.pop()
+
+        for line in lines:
+            entry = json.loads(line)
+            if "put" in entry:
+                self.events[entry["put"]] = entry["event"]
+            else:
+                self.events.pop(entry["delete"], None)
+
+        # 잘린 줄 뒤에 이어 쓰지 않도록 바로 스냅샷으로 합침
+        if truncated:
+            self.compact()
+        return self
+
+    def _put(self, event_id, event):
+        super()._put(event_id, event)
+        self.pending.append({"put": event_id, "event": event})
+
+    def _delete(self, event_id):
+        super()._delete(event_id)
+        self.pending.append({"delete": event_id})
+
+    def save(self):
+        """변경분을 저널에 덧붙이고, 저널이 크면 스냅샷으로 합침"""
+        if self.pending:
+            text = "".join(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n" for entry in self.pending)
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            self.pending = []
+
+        if not os.path.exists(self.path) or (
+            os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) > self.compact_bytes
+        ):
+            self.compact()
+
+    def compact(self):
+        """현재 이벤트로 스냅샷을 다시 쓰고 저널 비우기
+
+        스냅샷을 먼저 교체하므로 그 사이에 종료되어도 남은 저널을 다시 적용하면 같은 상태가 됩니다.
+        """
+        dump_json_events(self.path, self.events)
+        atomic_write(self.journal_path, "")
+        print(f"[{datetime.now()}] 저널 압축 완료: {len(self.events)}개 이벤트")
+
+
+class SqliteEventStore:
+    """이벤트 ID 기본 키 + 상영 날짜 인덱스 SQLite 저장소
+
+    새 이벤트 확인은 기본 키 조회로, 정리는 날짜 인덱스 DELETE로 처리하므로
+    누적된 이벤트 수와 관계없이 조회한 이벤트 수만큼만 일합니다.
+    """
+
+    def __init__(self, path, date_field, import_from=None):
+        self.path = path
+        self.date_field = date_field
+        self.import_from = import_from
+        self.conn = None
+
+    def load(self):
+        is_new = not os.path.exists(self.path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS events (
+                id TEXT PRIMARY KEY,
+                play_date TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_events_play_date ON events (play_date);
+        """)
+
+        # 처음 만들 때 기존 JSON 파일이 있으면 가져오기
+        if is_new and self.import_from and os.path.exists(self.import_from):
+            events = load_json_events(self.import_from)
+            self.upsert(events)
+            self.save()
+            print(f"[{datetime.now()}] {self.import_from} → {self.path}: {len(events)}개 이벤트 가져옴")
+        return self
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def unseen(self, event_ids):
+        event_ids = list(event_ids)
+        seen = set()
+        for i in range(0, len(event_ids), QUERY_CHUNK):
+            chunk = event_ids[i:i + QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(f"SELECT id FROM events WHERE id IN ({placeholders})", chunk)
+            seen.update(row[0] for row in rows)
+        return set(event_ids) - seen
+
+    def upsert(self, events):
+        before = self.conn.total_changes
+        # 내용이 같은 행은 다시 쓰지 않음
+        self.conn.executemany(
+            """INSERT INTO events (id, play_date, data) VALUES (?, ?, ?)
+               ON CONFLICT (id) DO UPDATE SET play_date = excluded.play_date, data = excluded.data
+               WHERE events.data != excluded.data""",
+            (
+                (event_id, event.get(self.date_field, "9999-99-99"),
+                 json.dumps(event, ensure_ascii=False, separators=(",", ":")))
+                for event_id, event in events.items()
+            ),
+        )
+        return self.conn.total_changes - before
+
+    def prune(self, cutoff_date):
+        return self.conn.execute("DELETE FROM events WHERE play_date < ?", (cutoff_date,)).rowcount
+
+    def save(self):
+        self.conn.commit()
+
+    def export(self):
+        return {event_id: json.loads(data) for event_id, data in self.conn.execute("SELECT id, data FROM events")}
+
+
+# ---------------------------------------------------------------------------
+# 본 이벤트 ID 인덱스
+# ---------------------------------------------------------------------------
+
+def id_hash(event_id):
+    """이벤트 ID의 64비트 해시"""
+    return int.from_bytes(hashlib.blake2b(event_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def date_number(play_date):
+    """YYYY-MM-DD / YYYYMMDD → YYYYMMDD 정수"""
+    return int(play_date.replace("-", ""))
+
+
+class SeenIndex:
+    """{ID 해시: 상영일} - 파일은 해시 배열(uint64) 뒤에 상영일 배열(uint32)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.dates = {}
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        count = len(data) // 12
+        hashes = array("Q", data[:count * 8])
+        dates = array("I", data[count * 8:count * 12])
+        self.dates = dict(zip(hashes, dates))
+        return self
+
+    def save(self, path=None):
+        atomic_write(path or self.path, array("Q", self.dates).tobytes() + array("I", self.dates.values()).tobytes())
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __contains__(self, key):
+        return key in self.dates
+
+    def add(self, key, play_date):
+        self.dates[key] = date_number(play_date)
+
+    def expired(self, cutoff_date):
+        cutoff = date_number(cutoff_date)
+        return [key for key, date in self.dates.items() if date < cutoff]
+
+    def remove(self, keys):
+        for key in keys:
+            del self.dates[key]
+
+
+class IndexedEventStore:
+    """본 이벤트 ID 인덱스 + 전체 이벤트 저장소
+
+    새 이벤트 확인과 첫 실행 판단은 인덱스만으로 처리합니다. 전체 이벤트는
+    새 이벤트가 있거나 지난 이벤트를 정리해야 할 때만 불러오며, 이미 본
+    이벤트의 좌석 수 같은 변경은 기록하지 않습니다.
+
+    저장은 새 인덱스를 <이름>.seen.next에 쓰고, 이벤트를 저장한 뒤 인덱스로 교체합니다.
+    불러올 때 .next가 남아 있으면 그 사이에 종료된 것이므로 저장된 이벤트로 인덱스를 다시 만듭니다.
+    """
+
+    def __init__(self, records, index_path):
+        self.records = records
+        self.index = SeenIndex(index_path)
+        self.pending_path = f"{index_path}.next"
+        self.date_field = records.date_field
+        self._records_loaded = False
+
+    def load(self):
+        self._records_loaded = False
+        if os.path.exists(self.pending_path):
+            print(f"[{datetime.now()}] 이벤트와 인덱스 저장 중에 종료됨 - 저장된 이벤트로 인덱스를 다시 만듭니다.")
+            self._rebuild()
+            self.index.save()
+            os.remove(self.pending_path)
+        elif self.index.exists():
+            self.index.load()
+        else:
+            # 인덱스가 없으면 저장된 이벤트로 한 번 만들기
+            self._rebuild()
+        return self
+
+    def _rebuild(self):
+        self.index = SeenIndex(self.index.path)
+        for event_id, event in self._records().export().items():
+            self.index.add(id_hash(event_id), event.get(self.date_field, "9999-99-99"))
+
+    def _records(self):
+        if not self._records_loaded:
+            self.records.load()
+            self._records_loaded = True
+        return self.records
+
+    def __len__(self):
+        return len(self.index)
+
+    def unseen(self, event_ids):
+        return {event_id for event_id in event_ids if id_hash(event_id) not in self.index}
+
+    def upsert(self, events):
+        new_events = {}
+        for event_id, event in events.items():
+            key = id_hash(event_id)
+            if key not in self.index:
+                self.index.add(key, event.get(self.date_field, "9999-99-99"))
+                new_events[event_id] = event
+        if new_events:
+            self._records().upsert(new_events)
+        return len(new_events)
+
+    def prune(self, cutoff_date):
+        expired = self.index.expired(cutoff_date)
+        if expired:
+            self._records().prune(cutoff_date)
+            self.index.remove(expired)
+        return len(expired)
+
+    def save(self):
+        if not self._records_loaded:
+            self.index.save()
+            return
+        self.index.save(self.pending_path)
+        self.records.save()
+        os.replace(self.pending_path, self.index.path)
+
+    def export(self):
+        return self._records().export()
+
+
+# ---------------------------------------------------------------------------
+# CGV 무대인사 목록 (stage_greetings.json: {"greetings": [...]})
+# ---------------------------------------------------------------------------
+
+# CGV 이벤트 보관 기간 (상영일 기준, 일)
+GREETING_RETENTION_DAYS = 14
+
+
+def greeting_play_date(greeting):
+    """CGV 이벤트 상영일 (YYYY-MM-DD)
+
+    playDate가 없는 예전 항목은 ID(극장_연_월_일_시간_영화)에서 계산합니다.
+    """
+    if greeting.get("playDate"):
+        return greeting["playDate"]
+    try:
+        _, year, month, day = greeting["id"].split("_")[:4]
+        return f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
+    except (KeyError, ValueError):
+        return "9999-99-99"
+
+
+class GreetingHistory:
+    """CGV 이벤트 목록 + ID 집합 (중복 확인은 집합 조회 한 번)
+
+    첫 실행 여부는 stored(파일이 있었는지)로 판단합니다 - 보관 기간이 지나 목록이
+    비어도 첫 실행으로 보고 새 이벤트 알림을 건너뛰지 않도록.
+    key(greeting)는 중복 확인 키 (기본은 id)입니다.
+    """
+
+    def __init__(self, path, retention_days=GREETING_RETENTION_DAYS, key=None):
+        self.path = path
+        self.retention_days = retention_days
+        self.key = key or (lambda g: g.get("id", ""))
+        self.greetings = []
+        self.ids = set()
+        self.stored = False
+
+    def load(self):
+        self.stored = os.path.exists(self.path)
+        if self.stored:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.greetings = json.load(f).get("greetings", [])
+        self.ids = {self.key(g) for g in self.greetings}
+        return self
+
+    def __len__(self):
+        return len(self.greetings)
+
+    def add(self, greetings):
+        """처음 보는 이벤트만 추가하고 그 목록 반환"""
+        new_greetings = []
+        for g in greetings:
+            key = self.key(g)
+            if g.get("id") and key not in self.ids:
+                self.ids.add(key)
+                self.greetings.append(g)
+                new_greetings.append(g)
+        return new_greetings
+
+    def prune(self, today=None):
+        """보관 기간이 지난 이벤트 삭제 - 삭제된 수 반환"""
+        today = today or datetime.now()
+        cutoff_date = (today - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        count = len(self.greetings)
+        self.greetings = [g for g in self.greetings if greeting_play_date(g) >= cutoff_date]
+        if len(self.greetings) != count:
+            self.ids = {self.key(g) for g in self.greetings}
+        return count - len(self.greetings)
+
+    def save(self):
+        atomic_write(self.path, json.dumps({"greetings": self.greetings}, ensure_ascii=False, indent=2))
+        self.stored = True
+
+
+def open_store(json_path, date_field, backend=STORE_BACKEND, file_format=STORE_FORMAT, seen_index=SEEN_INDEX):
+    """설정에 맞는 이벤트 저장소 생성 (load()는 호출하는 쪽에서)"""
+    if backend == "sqlite":
+        store = SqliteEventStore(os.path.splitext(json_path)[0] + ".db", date_field, import_from=json_path)
+    else:
+        path, import_from = json_path, None
+        if file_format == "packed":
+            path, import_from = os.path.splitext(json_path)[0] + ".bin", json_path
+        if backend == "journal":
+            store = JournalEventStore(path, date_field, import_from)
+        else:
+            store = JsonEventStore(path, date_field, import_from)
+
+    if seen_index:
+        return IndexedEventStore(store, os.path.splitext(json_path)[0] + ".seen")
+    return store
+
+
+def main():
+    if len(sys.argv) >= 5 and sys.argv[1] == "import":
+        _, _, json_path, db_path, date_field = sys.argv[:5]
+        store = SqliteEventStore(db_path, date_field).load()
+        changed = store.upsert(load_json_events(json_path))
+        store.save()
+        print(f"{json_path} → {db_path}: {changed}개 이벤트 기록 (전체 {len(store)}개)")
+    elif len(sys.argv) >= 4 and sys.argv[1] == "export":
+        _, _, db_path, json_path = sys.argv[:4]
+        events = SqliteEventStore(db_path, None).load().export()
+        dump_json_events(json_path, events)
+        print(f"{db_path} → {json_path}: {len(events)}개 이벤트")
+    elif len(sys.argv) >= 4 and sys.argv[1] == "compact":
+        # 저널을 스냅샷에 합침 (EVENT_STORE=json으로 되돌리기 전에 실행)
+        JournalEventStore(sys.argv[2], sys.argv[3]).load().compact()
+    elif len(sys.argv) >= 4 and sys.argv[1] in ("pack", "unpack"):
+        # 확장자(.bin 여부)로 형식을 정하므로 pack/unpack 모두 같은 변환
+        _, _, src_path, dst_path = sys.argv[:4]
+        events = load_json_events(src_path)
+        dump_json_events(dst_path, events)
+        print(f"{src_path} ({os.path.getsize(src_path):,}B) → {dst_path} ({os.path.getsize(dst_path):,}B): {len(events)}개 이벤트")
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+영화관 API / Discord 공용 HTTP 세션
+keep-alive 연결 풀을 재사용해서 요청마다 TCP+TLS 핸드셰이크를 하지 않도록 합니다.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 병렬 조회 워커 수 상한 (연결 풀 크기와 맞춤)
+# 실제 동시 요청 수는 concurrency.AdaptiveLimiter가 이 범위 안에서 조절합니다.
+MAX_WORKERS = 32
+
+# 세션 하나가 동시에 유지하는 호스트 수 (영화관 API + Discord)
+POOL_HOSTS = 4
+
+
+def create_session(pool_size=MAX_WORKERS):
+    """연결 풀이 설정된 requests 세션 생성
+
+    호스트별 연결 수는 pool_size로 제한되고(pool_block), 초과 요청은
+    새 연결을 만들지 않고 풀에 연결이 반납될 때까지 기다립니다.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_HOSTS,
+        pool_maxsize=pool_size,
+        pool_block=True,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -4,13 +4,26 @@
 새로운 이벤트 상영이 등록되면 Discord로 알림을 보냅니다.
 """
 
-import requests
 import json
 import os
 import random
+import sys
 from datetime import datetime, timezone, timedelta
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+
+import async_scan
+from concurrency import AdaptiveLimiter, log_summary, post_json
+from directory_cache import DirectoryCache
+from discord_notifier import field_lines
+from event_classifier import CLASSIFIER_VERSION, classify_lotte
+from event_store import open_store
+from http_session import MAX_WORKERS, create_session
+from outbox import Outbox
+from poll_scheduler import PollScheduler
+from response_cache import ResponseCache
+from sinks import build_sinks
 
 # 설정
 DISCORD_WEBHOOK_URL = os.environ.get(
@@ -18,6 +31,16 @@ DISCORD_WEBHOOK_URL = os.environ.get(
     "https://discord.com/api/webhooks/1465410522424934451/VsOivK4NUqeDW4TzNBogspvPPZXC-B6MbA_3V-objWYt0kymcez8kYyvkivtOaMqBBdi"
 )
 DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lotte_events.json")
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lotte_fingerprints.json")
+SCHEDULE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lotte_schedule.json")
+DIRECTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lotte_cinemas.json")
+OUTBOX_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lotte_outbox.json")
+
+# 조회 엔진: "thread" (기본) 또는 "async" (aiohttp 필요)
+SCAN_ENGINE = os.environ.get("SCAN_ENGINE", "thread")
+
+# 상주 모드(--daemon) 조회 간격 (초)
+DAEMON_INTERVAL = int(os.environ.get("DAEMON_INTERVAL", "60"))
 
 # 롯데시네마 API URLs
 CINEMA_URL = "https://www.lottecinema.co.kr/LCWS/Cinema/CinemaData.aspx"
@@ -30,13 +53,26 @@ HEADERS = {
     "Referer": "https://www.lottecinema.co.kr/NLCHS/Ticketing"
 }
 
-# 이벤트 타입 코드 (일반=10 제외)
-EVENT_CODES = {
-    30: "무대인사",
-    40: "GV",
-    50: "시사회",
-    230: "스페셜상영회",
-}
+# 공용 HTTP 세션 (영화관 목록/상영 조회/Discord 전송이 연결 풀을 공유)
+SESSION = create_session()
+
+# 알림 대상 (DISCORD_WEBHOOK_URL + NOTIFY_SINKS, 대상마다 연결 풀/동시 전송 수 제한)
+SINKS = build_sinks(DISCORD_WEBHOOK_URL)
+
+# 동시 요청 수 자동 조절 (AIMD)
+LIMITER = AdaptiveLimiter("롯데시네마", maximum=MAX_WORKERS)
+
+# 저장된 이벤트 (EVENT_STORE/EVENT_FORMAT/EVENT_INDEX로 저장 방식 선택)
+EVENTS = open_store(DATA_FILE, "playDate")
+
+# 응답 파서 버전 (parse_play_sequence가 추출하는 내용이 바뀌면 올림 - 응답 지문 캐시 무효화)
+PARSER_VERSION = 1
+
+# (영화관, 날짜)별 응답 지문 캐시
+RESPONSE_CACHE = ResponseCache(CACHE_FILE, f"{PARSER_VERSION}:{CLASSIFIER_VERSION}")
+
+# 날짜별 조회 주기 (가까운 날짜 우선)
+SCHEDULER = PollScheduler(SCHEDULE_FILE)
 
 # 서울/경기 지역 영화관 (알림 대상)
 SEOUL_GYEONGGI_CINEMAS = [
@@ -53,20 +89,6 @@ SEOUL_GYEONGGI_CINEMAS = [
 ]
 
 
-def load_saved_events():
-    """저장된 이벤트 목록 불러오기"""
-    if os.path.exists(DATA_FILE):
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
-
-
-def save_events(events):
-    """이벤트 목록 저장"""
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(events, f, ensure_ascii=False, indent=2)
-
-
 def get_all_cinemas():
     """서울/경기 영화관 목록 가져오기"""
     data = {
@@ -79,7 +101,7 @@ def get_all_cinemas():
     }
 
     try:
-        response = requests.post(CINEMA_URL, headers=HEADERS, data=data, timeout=10)
+        response = SESSION.post(CINEMA_URL, headers=HEADERS, data=data, timeout=10)
         result = response.json()
 
         if result.get("IsOK") == "true":
@@ -94,96 +116,139 @@ def get_all_cinemas():
     return []
 
 
-def fetch_cinema_events(cinema, dates):
-    """단일 영화관의 이벤트 조회"""
+# 영화관 목록 캐시 (TTL이 지나면 백그라운드 갱신, 실패 시 마지막 목록 사용)
+DIRECTORY = DirectoryCache(DIRECTORY_FILE, get_all_cinemas)
+
+
+def play_sequence_params(cinema, date):
+    """GetPlaySequence 요청 파라미터"""
+    return {
+        "paramList": json.dumps({
+            "MethodName": "GetPlaySequence",
+            "channelType": "HO",
+            "osType": "Chrome",
+            "osVersion": "Mozilla/5.0",
+            "playDate": date,
+            "cinemaID": f"1|0001|{cinema['CinemaID']}",
+            "representationMovieCode": ""
+        })
+    }
+
+
+def parse_play_sequence(cinema, date, result):
+    """GetPlaySequence 응답에서 이벤트 상영 추출"""
     events = {}
-    cinema_id = f"1|0001|{cinema['CinemaID']}"
     cinema_name = cinema['CinemaNameKR']
 
-    for date in dates:
-        try:
-            data = {
-                "paramList": json.dumps({
-                    "MethodName": "GetPlaySequence",
-                    "channelType": "HO",
-                    "osType": "Chrome",
-                    "osVersion": "Mozilla/5.0",
+    items = result.get("PlaySeqs", {}).get("Items", [])
+
+    for item in items:
+        # 이벤트 코드이거나 이벤트 키워드 포함
+        is_event, event_type = classify_lotte(item.get("AccompanyTypeCode"), item.get("AccompanyTypeNameKR"))
+        if is_event:
+            # 고유 ID 생성
+            event_id = f"{cinema['CinemaID']}_{date}_{item.get('StartTime')}_{item.get('MovieCode')}"
+
+            if event_id not in events:
+                events[event_id] = {
+                    "id": event_id,
+                    "cinemaID": cinema['CinemaID'],
+                    "cinemaName": cinema_name,
+                    "movieCode": item.get("MovieCode"),
+                    "movieName": item.get("MovieNameKR"),
                     "playDate": date,
-                    "cinemaID": cinema_id,
-                    "representationMovieCode": ""
-                })
-            }
-
-            response = requests.post(TICKETING_URL, headers=HEADERS, data=data, timeout=10)
-            result = response.json()
-
-            for item in result.get("PlaySeqs", {}).get("Items", []):
-                accompany_code = item.get("AccompanyTypeCode")
-                accompany_name = item.get("AccompanyTypeNameKR", "")
-
-                # 이벤트 코드이거나 이벤트 키워드 포함
-                is_event = (
-                    accompany_code in EVENT_CODES or
-                    "무대인사" in accompany_name or
-                    "GV" in accompany_name or
-                    "시사회" in accompany_name or
-                    "스페셜" in accompany_name
-                )
-
-                if is_event:
-                    # 고유 ID 생성
-                    event_id = f"{cinema['CinemaID']}_{date}_{item.get('StartTime')}_{item.get('MovieCode')}"
-
-                    if event_id not in events:
-                        events[event_id] = {
-                            "id": event_id,
-                            "cinemaID": cinema['CinemaID'],
-                            "cinemaName": cinema_name,
-                            "movieCode": item.get("MovieCode"),
-                            "movieName": item.get("MovieNameKR"),
-                            "playDate": date,
-                            "startTime": item.get("StartTime"),
-                            "endTime": item.get("EndTime"),
-                            "screenName": item.get("ScreenNameKR"),
-                            "eventType": accompany_name or EVENT_CODES.get(accompany_code, "특별상영"),
-                            "eventCode": accompany_code,
-                            "totalSeat": item.get("TotalSeatCount", 0),
-                            "restSeat": item.get("RemainSeatCount", 0),
-                        }
-        except:
-            continue
+                    "startTime": item.get("StartTime"),
+                    "endTime": item.get("EndTime"),
+                    "screenName": item.get("ScreenNameKR"),
+                    "eventType": event_type,
+                    "eventCode": item.get("AccompanyTypeCode"),
+                    "totalSeat": item.get("TotalSeatCount", 0),
+                    "restSeat": item.get("RemainSeatCount", 0),
+                }
 
     return events
 
 
+def partition_key(cinema, date):
+    """(영화관, 날짜) 파티션 키"""
+    return f"{cinema['CinemaID']}_{date}"
+
+
+def due_partitions(cinemas, days):
+    """이번 실행에 조회할 (cinema, date) 목록 (조회 주기가 된 파티션만)"""
+    partitions = []
+    for offset in range(days):
+        date = (datetime.now() + timedelta(days=offset)).strftime("%Y-%m-%d")
+        for cinema in cinemas:
+            partitions.append((partition_key(cinema, date), date, offset, (cinema, date)))
+    return SCHEDULER.due(partitions), len(partitions)
+
+
+def decode_play_sequence(cinema, date, content):
+    """응답 바이트에서 이벤트 추출 (지난 실행과 같은 응답이면 캐시 재사용)"""
+    key = partition_key(cinema, date)
+    events = RESPONSE_CACHE.extract(key, date, content, partial(parse_play_sequence, cinema, date))
+    SCHEDULER.mark(key)
+    return events
+
+
+def fetch_cinema_date_events(cinema, date):
+    """단일 영화관/날짜의 이벤트 조회 (병렬 처리 단위)"""
+    decode = partial(decode_play_sequence, cinema, date)
+
+    try:
+        return post_json(SESSION, LIMITER, TICKETING_URL, decode=decode,
+                         headers=HEADERS, data=play_sequence_params(cinema, date), timeout=10)
+    except Exception as e:
+        print(f"[{datetime.now()}] 조회 실패 ({cinema['CinemaNameKR']} {date}): {e}")
+        return {}
+
+
 def fetch_events(cinemas, days=7):
-    """이벤트 상영 조회 (병렬 처리)"""
+    """이벤트 상영 조회 (병렬 처리)
+
+    (영화관, 날짜) 단위로 작업을 나눠서 느린 영화관의 남은 날짜도
+    놀고 있는 워커가 가져가도록 합니다.
+    """
     events = {}
-    dates = [(datetime.now() + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+    tasks, total = due_partitions(cinemas, days)
 
-    print(f"[{datetime.now()}] 병렬 조회 시작 ({len(cinemas)}개 영화관, {days}일)...")
+    print(f"[{datetime.now()}] 병렬 조회 시작 ({len(cinemas)}개 영화관, {days}일, {len(tasks)}/{total}건)...")
 
-    with ThreadPoolExecutor(max_workers=20) as executor:
-        futures = {executor.submit(fetch_cinema_events, c, dates): c for c in cinemas}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [executor.submit(fetch_cinema_date_events, c, date) for c, date in tasks]
 
         completed = 0
         for future in as_completed(futures):
-            cinema_events = future.result()
-            events.update(cinema_events)
+            events.update(future.result())
             completed += 1
 
-            if completed % 30 == 0:
-                print(f"[{datetime.now()}] 진행: {completed}/{len(cinemas)} 영화관, 발견: {len(events)}개")
+            if completed % 200 == 0:
+                print(f"[{datetime.now()}] 진행: {completed}/{len(tasks)} 요청, 발견: {len(events)}개")
 
+    log_summary(LIMITER)
     return events
 
 
-def send_discord_notification(event):
-    """Discord로 알림 보내기"""
-    if not DISCORD_WEBHOOK_URL:
-        print(f"[{datetime.now()}] Discord webhook URL이 설정되지 않았습니다.")
-        return False
+def fetch_events_async(cinemas, days=7):
+    """이벤트 상영 조회 (asyncio)"""
+    tasks, total = due_partitions(cinemas, days)
+
+    print(f"[{datetime.now()}] 비동기 조회 시작 ({len(cinemas)}개 영화관, {days}일, {len(tasks)}/{total}건)...")
+
+    jobs = [
+        (TICKETING_URL, {"headers": HEADERS, "data": play_sequence_params(cinema, date)},
+         partial(decode_play_sequence, cinema, date))
+        for cinema, date in tasks
+    ]
+    limiter = AdaptiveLimiter("롯데시네마", maximum=async_scan.PER_HOST_LIMIT)
+    events = async_scan.run_scan(jobs, limiter)
+    log_summary(limiter)
+    return events
+
 
+def build_embed(event):
+    """이벤트 하나의 Discord embed"""
     # 날짜 포맷팅
     play_date = event["playDate"]
     formatted_date = play_date  # 이미 YYYY-MM-DD 형식
@@ -191,36 +256,130 @@ def send_discord_notification(event):
     # 예매 URL
     booking_url = f"https://www.lottecinema.co.kr/NLCHS/Ticketing"
 
-    embed = {
-        "embeds": [
-            {
-                "title": f"🎬 [{event['eventType']}] 롯데시네마",
-                "description": event["movieName"],
-                "url": booking_url,
-                "color": 0xFFFFFF,  # 흰색
-                "fields": [
-                    {"name": "📍 지점", "value": event["cinemaName"], "inline": True},
-                    {"name": "📅 날짜", "value": formatted_date, "inline": True},
-                    {"name": "⏰ 시간", "value": f"{event['startTime']} ~ {event['endTime']}", "inline": True},
-                    {"name": "🎥 상영관", "value": event["screenName"] or "-", "inline": True},
-                ],
-                "footer": {"text": "롯데시네마 이벤트 모니터"},
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            }
-        ]
+    return {
+        "title": f"🎬 [{event['eventType']}] 롯데시네마",
+        "description": event["movieName"],
+        "url": booking_url,
+        "color": 0xFFFFFF,  # 흰색
+        "fields": [
+            {"name": "📍 지점", "value": event["cinemaName"], "inline": True},
+            {"name": "📅 날짜", "value": formatted_date, "inline": True},
+            {"name": "⏰ 시간", "value": f"{event['startTime']} ~ {event['endTime']}", "inline": True},
+            {"name": "🎥 상영관", "value": event["screenName"] or "-", "inline": True},
+        ],
+        "footer": {"text": "롯데시네마 이벤트 모니터"},
+        "timestamp": datetime.now(timezone.utc).isoformat(),
     }
 
-    try:
-        response = requests.post(DISCORD_WEBHOOK_URL, json=embed, timeout=10)
-        if response.status_code == 204:
-            print(f"[{datetime.now()}] 알림 전송 완료: {event['movieName']} @ {event['cinemaName']}")
-            return True
-        else:
-            print(f"[{datetime.now()}] 알림 전송 실패: {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"[{datetime.now()}] Discord 전송 오류: {e}")
-        return False
+
+def build_digest_embed(events):
+    """같은 영화/영화관/날짜 이벤트 묶음의 Discord embed (상영 시간을 모두 나열)"""
+    embed = build_embed(events[0])
+    if len(events) == 1:
+        return embed
+
+    events = sorted(events, key=lambda e: e["startTime"])
+    event_types = ", ".join(dict.fromkeys(e["eventType"] for e in events))
+    embed["title"] = f"🎬 [{event_types}] 롯데시네마 ({len(events)}회)"
+    embed["fields"] = [
+        {"name": "📍 지점", "value": events[0]["cinemaName"], "inline": True},
+        {"name": "📅 날짜", "value": events[0]["playDate"], "inline": True},
+        {"name": "⏰ 시간", "value": field_lines([
+            f"{e['startTime']} ~ {e['endTime']} ({e['screenName'] or '-'})" for e in events
+        ]), "inline": False},
+    ]
+    return embed
+
+
+# 알림 대기열 (전송 성공 전까지 파일에 보관, 같은 영화/영화관/날짜는 묶어서 백그라운드 전송)
+OUTBOX = Outbox(OUTBOX_FILE, SINKS, build_digest_embed)
+
+
+def queue_notifications(events):
+    """알림을 대기열에 추가 (백그라운드에서 묶어서 모든 알림 대상에 전송)"""
+    if not SINKS:
+        print(f"[{datetime.now()}] 알림 대상이 설정되지 않았습니다.")
+        return
+
+    OUTBOX.put([
+        (event["id"], f"{event['movieCode']}_{event['cinemaID']}_{event['playDate']}", event,
+         f"{event['movieName']} @ {event['cinemaName']}")
+        for event in events
+    ])
+
+
+def send_start_message(event_count):
+    """첫 실행 알림"""
+    if DISCORD_WEBHOOK_URL:
+        test_msg = {
+            "content": f"✅ 롯데시네마 이벤트 모니터링이 시작되었습니다!\n현재 {event_count}개의 이벤트 상영을 추적 중입니다."
+        }
+        try:
+            SESSION.post(DISCORD_WEBHOOK_URL, json=test_msg, timeout=10)
+        except:
+            pass
+
+
+def load_state():
+    """저장된 이벤트/응답 지문/조회 스케줄 불러오기 + 알림 대기열 전송 시작"""
+    EVENTS.load()
+    RESPONSE_CACHE.load()
+    SCHEDULER.load()
+    if SINKS:
+        OUTBOX.start()
+
+
+def save_state(events_changed=True):
+    """상태 저장 (이벤트 저장소는 변경이 있을 때만 기록)"""
+    if events_changed:
+        EVENTS.save()
+
+    # 응답 지문/조회 스케줄 저장 (지난 날짜 제외)
+    RESPONSE_CACHE.prune(datetime.now().strftime("%Y-%m-%d"))
+    RESPONSE_CACHE.save()
+    SCHEDULER.prune(datetime.now().strftime("%Y-%m-%d"))
+    SCHEDULER.save()
+    print(f"[{datetime.now()}] {RESPONSE_CACHE.summary()}")
+    RESPONSE_CACHE.reset_stats()
+
+
+def scan_and_notify(cinemas, is_first_run):
+    """이벤트 조회 → 새 이벤트 알림 → 이벤트 저장소 갱신
+
+    (current_events, new_events, events_changed)를 반환합니다.
+    """
+    # 이벤트 상영 조회
+    print(f"[{datetime.now()}] 이벤트 상영 조회 중 (14일간)...")
+    if SCAN_ENGINE == "async" and not async_scan.available():
+        print(f"[{datetime.now()}] aiohttp가 없어 스레드 엔진으로 조회합니다.")
+
+    if SCAN_ENGINE == "async" and async_scan.available():
+        current_events = fetch_events_async(cinemas, days=14)
+    else:
+        current_events = fetch_events(cinemas, days=14)
+    print(f"[{datetime.now()}] 발견된 이벤트: {len(current_events)}개")
+
+    # 새로운 이벤트 찾기
+    new_ids = EVENTS.unseen(current_events)
+    new_events = [event for event_id, event in current_events.items() if event_id in new_ids]
+
+    print(f"[{datetime.now()}] 새로운 이벤트: {len(new_events)}개")
+
+    # 새 이벤트 알림 보내기 (서울/경기 지역만)
+    if not is_first_run and new_events:
+        queue_notifications([
+            event for event in new_events if event.get("cinemaName") in SEOUL_GYEONGGI_CINEMAS
+        ])
+
+    # 이벤트 저장 (새로 생기거나 바뀐 이벤트만)
+    changed = EVENTS.upsert(current_events)
+
+    # 오래된 이벤트 정리 (14일 이상 지난 이벤트 삭제)
+    cutoff_date = (datetime.now() - timedelta(days=14)).strftime("%Y-%m-%d")
+    removed = EVENTS.prune(cutoff_date)
+
+    events_changed = bool(changed or removed)
+    return current_events, new_events, events_changed
 
 
 def main():
@@ -233,64 +392,79 @@ def main():
     start_time = time.time()
 
     # 저장된 이벤트 불러오기
-    saved_events = load_saved_events()
-    is_first_run = len(saved_events) == 0
+    load_state()
+    is_first_run = len(EVENTS) == 0
 
     if is_first_run:
         print(f"[{datetime.now()}] 첫 실행 - 기존 이벤트 수집 중...")
+        SCHEDULER.reset()
 
     # 전체 영화관 목록 가져오기
     print(f"[{datetime.now()}] 영화관 목록 조회 중...")
-    cinemas = get_all_cinemas()
+    cinemas = DIRECTORY.get()
     print(f"[{datetime.now()}] 전체 영화관 수: {len(cinemas)}")
 
     if not cinemas:
         print(f"[{datetime.now()}] 영화관 목록을 가져올 수 없습니다.")
+        OUTBOX.close()
         return
 
-    # 이벤트 상영 조회 (7일)
-    print(f"[{datetime.now()}] 이벤트 상영 조회 중 (14일간)...")
-    current_events = fetch_events(cinemas, days=14)
-    print(f"[{datetime.now()}] 발견된 이벤트: {len(current_events)}개")
-
-    # 새로운 이벤트 찾기
-    new_events = []
-    for event_id, event in current_events.items():
-        if event_id not in saved_events:
-            new_events.append(event)
+    current_events, _, _ = scan_and_notify(cinemas, is_first_run)
+    save_state()
 
-    print(f"[{datetime.now()}] 새로운 이벤트: {len(new_events)}개")
+    elapsed = time.time() - start_time
+    print(f"[{datetime.now()}] 완료! 소요 시간: {elapsed:.1f}초")
 
-    # 새 이벤트 알림 보내기 (서울/경기 지역만)
-    if not is_first_run and new_events:
-        for event in new_events:
-            if event.get("cinemaName") in SEOUL_GYEONGGI_CINEMAS:
-                send_discord_notification(event)
-                time.sleep(0.5)  # Discord rate limit 방지
+    if is_first_run:
+        print(f"[{datetime.now()}] 첫 실행 완료 - {len(current_events)}개 이벤트 저장됨")
+        send_start_message(len(current_events))
 
-    # 이벤트 저장 (기존 + 새로운)
-    saved_events.update(current_events)
+    # 남은 알림 전송 대기 (못 보낸 알림은 다음 실행에서 재전송)
+    OUTBOX.close()
 
-    # 오래된 이벤트 정리 (14일 이상 지난 이벤트 삭제)
-    cutoff_date = (datetime.now() - timedelta(days=14)).strftime("%Y-%m-%d")
-    saved_events = {k: v for k, v in saved_events.items() if v.get("playDate", "9999-99-99") >= cutoff_date}
 
-    save_events(saved_events)
+def run_daemon(interval=DAEMON_INTERVAL):
+    """상주 모드 - HTTP 연결 풀, 영화관 목록, 이벤트 저장소를 유지하고 주기적으로 조회"""
+    print(f"[{datetime.now()}] 롯데시네마 이벤트 모니터링 시작 (상주 모드, {interval}초 간격)...")
 
-    elapsed = time.time() - start_time
-    print(f"[{datetime.now()}] 완료! 소요 시간: {elapsed:.1f}초")
+    load_state()
+    announced = False
 
-    if is_first_run:
-        print(f"[{datetime.now()}] 첫 실행 완료 - {len(current_events)}개 이벤트 저장됨")
-        if DISCORD_WEBHOOK_URL:
-            test_msg = {
-                "content": f"✅ 롯데시네마 이벤트 모니터링이 시작되었습니다!\n현재 {len(current_events)}개의 이벤트 상영을 추적 중입니다."
-            }
-            try:
-                requests.post(DISCORD_WEBHOOK_URL, json=test_msg, timeout=10)
-            except:
-                pass
+    try:
+        while True:
+            start_time = time.time()
+
+            cinemas = DIRECTORY.get()
+            if cinemas:
+                is_first_run = len(EVENTS) == 0
+                if is_first_run:
+                    SCHEDULER.reset()
+
+                try:
+                    current_events, _, events_changed = scan_and_notify(cinemas, is_first_run)
+                    save_state(events_changed)
+                except Exception as e:
+                    print(f"[{datetime.now()}] 조회 오류: {e}")
+                else:
+                    if is_first_run and not announced:
+                        send_start_message(len(current_events))
+                        announced = True
+            else:
+                print(f"[{datetime.now()}] 영화관 목록을 가져올 수 없습니다.")
+
+            elapsed = time.time() - start_time
+            print(f"[{datetime.now()}] 조회 완료 ({elapsed:.1f}초)")
+
+            # 다음 조회까지 대기 (±20% 지터 - 봇 패턴 회피)
+            time.sleep(max(0, interval * random.uniform(0.8, 1.2) - elapsed))
+    except KeyboardInterrupt:
+        print(f"[{datetime.now()}] 상주 모드 종료 - 상태 저장 중...")
+        save_state()
+        OUTBOX.close()
 
 
 if __name__ == "__main__":
-    main()
+    if "--daemon" in sys.argv:
+        run_daemon()
+    else:
+        main()
@@ -4,13 +4,25 @@
 새로운 이벤트 상영이 등록되면 Discord로 알림을 보냅니다.
 """
 
-import requests
-import json
 import os
 import random
+import sys
 from datetime import datetime, timezone, timedelta
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+
+import async_scan
+from concurrency import AdaptiveLimiter, log_summary, post_json
+from directory_cache import DirectoryCache
+from discord_notifier import field_lines
+from event_classifier import CLASSIFIER_VERSION, classify_megabox
+from event_store import open_store
+from http_session import MAX_WORKERS, create_session
+from outbox import Outbox
+from poll_scheduler import PollScheduler
+from response_cache import ResponseCache
+from sinks import build_sinks
 
 # 설정
 # Discord Webhook URL (환경변수 또는 기본값)
@@ -19,18 +31,23 @@ DISCORD_WEBHOOK_URL = os.environ.get(
     "https://discord.com/api/webhooks/1465405351108153425/vWY6nTRfFs3fKJyx3EM2SrwmKjnWQaySkHcCvDi2vxrwSEDFhf5t34I37qUX4Bz31c3E"
 )
 DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "megabox_events.json")
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "megabox_fingerprints.json")
+SCHEDULE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "megabox_schedule.json")
+DIRECTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "megabox_branches.json")
+OUTBOX_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "megabox_outbox.json")
+
+# 조회 엔진: "thread" (기본) 또는 "async" (aiohttp 필요)
+SCAN_ENGINE = os.environ.get("SCAN_ENGINE", "thread")
+
+# selectBokdList.do 한 번에 묶어서 조회할 지점 수 (benchmarks/megabox_batch.py로 측정)
+BATCH_SIZE = int(os.environ.get("MEGABOX_BATCH_SIZE", "1"))
+
+# 상주 모드(--daemon) 조회 간격 (초)
+DAEMON_INTERVAL = int(os.environ.get("DAEMON_INTERVAL", "60"))
 
 # 알림 대상 지역 (서울/경기만)
 TARGET_REGIONS = ["서울", "경기"]
 
-# 이벤트 키워드
-EVENT_KEYWORDS = [
-    "무대인사", "GV", "관객과의대화", "관객과의 대화",
-    "시사회", "라이브뷰잉", "라이브 뷰잉", "LIVE", "Live",
-    "콘서트", "concert", "싱어롱", "sing-along", "응원상영",
-    "큐앤에이", "Q&A", "토크", "굿즈", "특별상영"
-]
-
 # 메가박스 API 설정
 MEGABOX_API_URL = "https://www.megabox.co.kr/on/oh/ohb/SimpleBooking/selectBokdList.do"
 MEGABOX_HEADERS = {
@@ -40,51 +57,35 @@ MEGABOX_HEADERS = {
     "Referer": "https://www.megabox.co.kr/booking"
 }
 
+# 공용 HTTP 세션 (영화관 목록/상영 조회/Discord 전송이 연결 풀을 공유)
+SESSION = create_session()
 
-def load_saved_events():
-    """저장된 이벤트 목록 불러오기"""
-    if os.path.exists(DATA_FILE):
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+# 알림 대상 (DISCORD_WEBHOOK_URL + NOTIFY_SINKS, 대상마다 연결 풀/동시 전송 수 제한)
+SINKS = build_sinks(DISCORD_WEBHOOK_URL)
 
+# 동시 요청 수 자동 조절 (AIMD)
+LIMITER = AdaptiveLimiter("메가박스", maximum=MAX_WORKERS)
 
-def save_events(events):
-    """이벤트 목록 저장"""
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(events, f, ensure_ascii=False, indent=2)
+# 저장된 이벤트 (EVENT_STORE/EVENT_FORMAT/EVENT_INDEX로 저장 방식 선택)
+EVENTS = open_store(DATA_FILE, "playDe")
 
+# 응답 파서 버전 (parse_batch_shows가 추출하는 내용이 바뀌면 올림 - 응답 지문 캐시 무효화)
+PARSER_VERSION = 1
 
-def is_event_show(movie_name, event_div_cd=None, ctts_ty_div_cd=None):
-    """이벤트 상영인지 확인"""
-    # 이벤트 코드가 있으면 이벤트 상영
-    if event_div_cd:
-        return True
+# (지점, 날짜)별 응답 지문 캐시
+RESPONSE_CACHE = ResponseCache(CACHE_FILE, f"{PARSER_VERSION}:{CLASSIFIER_VERSION}")
 
-    # 영화 제목에 이벤트 키워드가 있으면 이벤트 상영
-    movie_name_lower = movie_name.lower()
-    for keyword in EVENT_KEYWORDS:
-        if keyword.lower() in movie_name_lower:
-            return True
-
-    return False
+# 날짜별 조회 주기 (가까운 날짜 우선)
+SCHEDULER = PollScheduler(SCHEDULE_FILE)
 
 
 def get_all_branches():
     """서울/경기 지점 목록 가져오기"""
-    data = {
-        "arrMovieNo": "",
-        "playDe": datetime.now().strftime("%Y%m%d"),
-        "brchNoListCnt": 1,
-        "brchNo1": "1351",  # 코엑스 (기준점)
-        "areaCd1": "",
-        "theabKindCd1": "",
-        "movieNo1": "",
-        "sellChnlCd": ""
-    }
+    # 코엑스(1351)를 기준점으로 조회하면 전체 지점 목록이 함께 내려옴
+    data = bokd_list_payload(["1351"], datetime.now().strftime("%Y%m%d"))
 
     try:
-        response = requests.post(MEGABOX_API_URL, headers=MEGABOX_HEADERS, json=data, timeout=10)
+        response = SESSION.post(MEGABOX_API_URL, headers=MEGABOX_HEADERS, json=data, timeout=10)
         result = response.json()
 
         branches = []
@@ -103,93 +104,201 @@ def get_all_branches():
         return []
 
 
-def fetch_branch_events(brch, dates):
-    """단일 지점의 이벤트 조회 (병렬 처리용)"""
+# 지점 목록 캐시 (TTL이 지나면 백그라운드 갱신, 실패 시 마지막 목록 사용)
+DIRECTORY = DirectoryCache(DIRECTORY_FILE, get_all_branches)
+
+
+def bokd_list_payload(brch_nos, date):
+    """selectBokdList.do 요청 본문 (여러 지점을 한 번에 조회 가능)"""
+    data = {
+        "arrMovieNo": "",
+        "playDe": date,
+        "brchNoListCnt": len(brch_nos),
+    }
+    for i, brch_no in enumerate(brch_nos, 1):
+        data[f"brchNo{i}"] = brch_no
+        data[f"areaCd{i}"] = ""
+        data[f"theabKindCd{i}"] = ""
+        data[f"movieNo{i}"] = ""
+    data["sellChnlCd"] = ""
+    return data
+
+
+def parse_branch_shows(brch, date, result):
+    """selectBokdList.do 응답에서 이벤트 상영 추출"""
     branch_events = {}
     brch_no = brch["brchNo"]
     brch_nm = brch["brchNm"]
 
-    for date in dates:
-        data = {
-            "arrMovieNo": "",
-            "playDe": date,
-            "brchNoListCnt": 1,
-            "brchNo1": brch_no,
-            "areaCd1": "",
-            "theabKindCd1": "",
-            "movieNo1": "",
-            "sellChnlCd": ""
-        }
-
-        try:
-            response = requests.post(MEGABOX_API_URL, headers=MEGABOX_HEADERS, json=data, timeout=10)
-            result = response.json()
-
-            for show in result.get("movieFormList", []):
-                movie_nm = show.get("movieNm", "")
-                event_div_cd = show.get("eventDivCd")
-                ctts_ty_div_cd = show.get("cttsTyDivCd")
-
-                if is_event_show(movie_nm, event_div_cd, ctts_ty_div_cd):
-                    play_schdl_no = show.get("playSchdlNo", "")
-                    event_id = f"{brch_no}_{date}_{show.get('playStartTime', '')}_{show.get('movieNo', '')}"
-
-                    if event_id not in branch_events:
-                        matched_keywords = [kw for kw in EVENT_KEYWORDS if kw.lower() in movie_nm.lower()]
-
-                        branch_events[event_id] = {
-                            "id": event_id,
-                            "playSchdlNo": play_schdl_no,
-                            "movieNo": show.get("movieNo", ""),
-                            "movieNm": movie_nm,
-                            "brchNo": brch_no,
-                            "brchNm": brch_nm,
-                            "areaCdNm": brch.get("areaCdNm", ""),
-                            "playDe": date,
-                            "playStartTime": show.get("playStartTime", ""),
-                            "playEndTime": show.get("playEndTime", ""),
-                            "theabExpoNm": show.get("theabExpoNm", ""),
-                            "eventDivCdNm": show.get("eventDivCdNm", ""),
-                            "restSeatCnt": show.get("restSeatCnt", 0),
-                            "totSeatCnt": show.get("totSeatCnt", 0),
-                            "bokdAbleAt": show.get("bokdAbleAt", "N"),
-                            "matchedKeywords": matched_keywords,
-                            "moviePosterImg": show.get("moviePosterImg", "")
-                        }
-        except:
-            continue
+    shows = result.get("movieFormList", [])
+    for show in shows:
+        is_event, matched_keywords = classify_megabox(show.get("movieNm") or "", show.get("eventDivCd"))
+        if is_event:
+            movie_nm = show.get("movieNm", "")
+            play_schdl_no = show.get("playSchdlNo", "")
+            event_id = f"{brch_no}_{date}_{show.get('playStartTime', '')}_{show.get('movieNo', '')}"
+
+            if event_id not in branch_events:
+                branch_events[event_id] = {
+                    "id": event_id,
+                    "playSchdlNo": play_schdl_no,
+                    "movieNo": show.get("movieNo", ""),
+                    "movieNm": movie_nm,
+                    "brchNo": brch_no,
+                    "brchNm": brch_nm,
+                    "areaCdNm": brch.get("areaCdNm", ""),
+                    "playDe": date,
+                    "playStartTime": show.get("playStartTime", ""),
+                    "playEndTime": show.get("playEndTime", ""),
+                    "theabExpoNm": show.get("theabExpoNm", ""),
+                    "eventDivCdNm": show.get("eventDivCdNm", ""),
+                    "restSeatCnt": show.get("restSeatCnt", 0),
+                    "totSeatCnt": show.get("totSeatCnt", 0),
+                    "bokdAbleAt": show.get("bokdAbleAt", "N"),
+                    "matchedKeywords": matched_keywords,
+                    "moviePosterImg": show.get("moviePosterImg", "")
+                }
 
     return branch_events
 
 
+def split_batch_shows(brchs, result):
+    """여러 지점을 함께 조회한 응답의 상영 행을 지점별로 나누기
+
+    ({brchNo: [show, ...]}, 묶음 지점 중 어디에도 속하지 않는 행 수) 반환 - brchNo가 없거나
+    묶음에 없는 지점 번호인 행은 어느 지점 것인지 알 수 없습니다.
+    """
+    shows = result.get("movieFormList", [])
+    if len(brchs) == 1:
+        return {str(brchs[0]["brchNo"]): shows}, 0
+
+    shows_by_brch = {str(brch["brchNo"]): [] for brch in brchs}
+    unassigned = 0
+    for show in shows:
+        brch_shows = shows_by_brch.get(str(show.get("brchNo", "")))
+        if brch_shows is None:
+            unassigned += 1
+        else:
+            brch_shows.append(show)
+    return shows_by_brch, unassigned
+
+
+def parse_batch_shows(brchs, date, result):
+    """여러 지점을 함께 조회한 응답을 지점별로 나눠서 이벤트 추출"""
+    if len(brchs) == 1:
+        return parse_branch_shows(brchs[0], date, result)
+
+    shows_by_brch, unassigned = split_batch_shows(brchs, result)
+    if unassigned:
+        print(f"[{datetime.now()}] 지점을 알 수 없는 상영 {unassigned}건 제외 ({date}, 지점 {len(brchs)}개 묶음) "
+              f"- MEGABOX_BATCH_SIZE를 줄이세요")
+
+    events = {}
+    for brch in brchs:
+        shows = shows_by_brch[str(brch["brchNo"])]
+        events.update(parse_branch_shows(brch, date, {"movieFormList": shows}))
+    return events
+
+
+def partition_key(brch, date):
+    """(지점, 날짜) 파티션 키"""
+    return f"{brch['brchNo']}_{date}"
+
+
+def due_partitions(branches, days, batch_size=BATCH_SIZE):
+    """이번 실행에 조회할 (brchs, date) 목록 (조회 주기가 된 파티션만)
+
+    같은 날짜의 지점은 batch_size개씩 묶어서 한 번에 조회합니다.
+    """
+    partitions = []
+    for offset in range(days):
+        date = (datetime.now() + timedelta(days=offset)).strftime("%Y%m%d")
+        for brch in branches:
+            partitions.append((partition_key(brch, date), date, offset, (brch, date)))
+    due = SCHEDULER.due(partitions)
+
+    by_date = {}
+    for brch, date in due:
+        by_date.setdefault(date, []).append(brch)
+
+    tasks = []
+    for date, brchs in by_date.items():
+        brchs.sort(key=lambda b: b["brchNo"])
+        for i in range(0, len(brchs), batch_size):
+            tasks.append((brchs[i:i + batch_size], date))
+    return tasks, len(partitions)
+
+
+def decode_batch_shows(brchs, date, content):
+    """응답 바이트에서 이벤트 추출 (지난 실행과 같은 응답이면 캐시 재사용)"""
+    keys = [partition_key(brch, date) for brch in brchs]
+    events = RESPONSE_CACHE.extract("+".join(keys), date, content, partial(parse_batch_shows, brchs, date))
+    for key in keys:
+        SCHEDULER.mark(key)
+    return events
+
+
+def fetch_batch_events(brchs, date):
+    """지점 묶음/날짜의 이벤트 조회 (병렬 처리 단위)"""
+    decode = partial(decode_batch_shows, brchs, date)
+    brch_nos = [brch["brchNo"] for brch in brchs]
+
+    try:
+        return post_json(SESSION, LIMITER, MEGABOX_API_URL, decode=decode,
+                         headers=MEGABOX_HEADERS, json=bokd_list_payload(brch_nos, date), timeout=10)
+    except Exception as e:
+        names = ", ".join(brch["brchNm"] for brch in brchs)
+        print(f"[{datetime.now()}] 조회 실패 ({names} {date}): {e}")
+        return {}
+
+
 def fetch_events(branches, days=7):
-    """이벤트 상영 조회 (병렬 처리)"""
+    """이벤트 상영 조회 (병렬 처리)
+
+    (지점 묶음, 날짜) 단위로 작업을 나눠서 느린 지점의 남은 날짜도
+    놀고 있는 워커가 가져가도록 합니다.
+    """
     events = {}
-    dates = [(datetime.now() + timedelta(days=i)).strftime("%Y%m%d") for i in range(days)]
+    tasks, total = due_partitions(branches, days)
+    due = sum(len(brchs) for brchs, _ in tasks)
 
-    print(f"[{datetime.now()}] 병렬 조회 시작 ({len(branches)}개 지점, {days}일)...")
+    print(f"[{datetime.now()}] 병렬 조회 시작 ({len(branches)}개 지점, {days}일, {due}/{total}건, 요청 {len(tasks)}회)...")
 
-    with ThreadPoolExecutor(max_workers=20) as executor:
-        futures = {executor.submit(fetch_branch_events, brch, dates): brch for brch in branches}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [executor.submit(fetch_batch_events, brchs, date) for brchs, date in tasks]
 
         completed = 0
         for future in as_completed(futures):
-            branch_events = future.result()
-            events.update(branch_events)
+            events.update(future.result())
             completed += 1
 
-            if completed % 30 == 0:
-                print(f"[{datetime.now()}] 진행: {completed}/{len(branches)} 지점, 발견: {len(events)}개")
+            if completed % 200 == 0:
+                print(f"[{datetime.now()}] 진행: {completed}/{len(tasks)} 요청, 발견: {len(events)}개")
 
+    log_summary(LIMITER)
     return events
 
 
-def send_discord_notification(event):
-    """Discord로 알림 보내기"""
-    if not DISCORD_WEBHOOK_URL:
-        print(f"[{datetime.now()}] Discord webhook URL이 설정되지 않았습니다.")
-        return False
+def fetch_events_async(branches, days=7):
+    """이벤트 상영 조회 (asyncio)"""
+    tasks, total = due_partitions(branches, days)
+    due = sum(len(brchs) for brchs, _ in tasks)
+
+    print(f"[{datetime.now()}] 비동기 조회 시작 ({len(branches)}개 지점, {days}일, {due}/{total}건, 요청 {len(tasks)}회)...")
+
+    jobs = [
+        (MEGABOX_API_URL, {"headers": MEGABOX_HEADERS, "json": bokd_list_payload([b["brchNo"] for b in brchs], date)},
+         partial(decode_batch_shows, brchs, date))
+        for brchs, date in tasks
+    ]
+    limiter = AdaptiveLimiter("메가박스", maximum=async_scan.PER_HOST_LIMIT)
+    events = async_scan.run_scan(jobs, limiter)
+    log_summary(limiter)
+    return events
+
 
+def build_embed(event):
+    """이벤트 하나의 Discord embed"""
     # 날짜 포맷팅
     play_de = event["playDe"]
     formatted_date = f"{play_de[:4]}-{play_de[4:6]}-{play_de[6:]}"
@@ -205,24 +314,20 @@ def send_discord_notification(event):
     booking_url = f"http://m.megabox.co.kr/booking?brchNo={event['brchNo']}&playDe={event['playDe']}&movieNo={event['movieNo']}"
 
     embed = {
-        "embeds": [
-            {
-                "title": f"🎬 [{event_type}] 메가박스",
-                "description": event["movieNm"],
-                "url": booking_url,
-                "color": 0x352263,  # 메가박스 보라색
-                "fields": [
-                    {"name": "📍 지점", "value": f"{event['areaCdNm']} {event['brchNm']}", "inline": True},
-                    {"name": "📅 날짜", "value": formatted_date, "inline": True},
-                    {"name": "⏰ 시간", "value": f"{event['playStartTime']} ~ {event['playEndTime']}", "inline": True},
-                    {"name": "🎥 상영관", "value": event["theabExpoNm"], "inline": True},
-                    {"name": "💺 좌석", "value": seat_info, "inline": True},
-                    {"name": "🎫 상태", "value": bokd_status, "inline": True},
-                ],
-                "footer": {"text": "메가박스 이벤트 모니터"},
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            }
-        ]
+        "title": f"🎬 [{event_type}] 메가박스",
+        "description": event["movieNm"],
+        "url": booking_url,
+        "color": 0x352263,  # 메가박스 보라색
+        "fields": [
+            {"name": "📍 지점", "value": f"{event['areaCdNm']} {event['brchNm']}", "inline": True},
+            {"name": "📅 날짜", "value": formatted_date, "inline": True},
+            {"name": "⏰ 시간", "value": f"{event['playStartTime']} ~ {event['playEndTime']}", "inline": True},
+            {"name": "🎥 상영관", "value": event["theabExpoNm"], "inline": True},
+            {"name": "💺 좌석", "value": seat_info, "inline": True},
+            {"name": "🎫 상태", "value": bokd_status, "inline": True},
+        ],
+        "footer": {"text": "메가박스 이벤트 모니터"},
+        "timestamp": datetime.now(timezone.utc).isoformat(),
     }
 
     # 포스터 이미지 추가
@@ -230,19 +335,123 @@ def send_discord_notification(event):
         img_url = event["moviePosterImg"]
         if not img_url.startswith("http"):
             img_url = f"https://img.megabox.co.kr{img_url}"
-        embed["embeds"][0]["thumbnail"] = {"url": img_url}
+        embed["thumbnail"] = {"url": img_url}
+
+    return embed
+
+
+def build_digest_embed(events):
+    """같은 영화/지점/날짜 이벤트 묶음의 Discord embed (상영 시간을 모두 나열)"""
+    embed = build_embed(events[0])
+    if len(events) == 1:
+        return embed
+
+    events = sorted(events, key=lambda e: e["playStartTime"])
+    event_types = ", ".join(dict.fromkeys(
+        e.get("eventDivCdNm") or ", ".join(e.get("matchedKeywords", [])) or "특별상영" for e in events
+    ))
+    embed["title"] = f"🎬 [{event_types}] 메가박스 ({len(events)}회)"
+    embed["fields"] = [
+        embed["fields"][0],  # 지점
+        embed["fields"][1],  # 날짜
+        {"name": "⏰ 시간", "value": field_lines([
+            f"{e['playStartTime']} ~ {e['playEndTime']} {e['theabExpoNm']} "
+            f"({e['restSeatCnt']}/{e['totSeatCnt']}석{'' if e['bokdAbleAt'] == 'Y' else ', 예매 불가'})"
+            for e in events
+        ]), "inline": False},
+    ]
+    return embed
+
+
+# 알림 대기열 (전송 성공 전까지 파일에 보관, 같은 영화/지점/날짜는 묶어서 백그라운드 전송)
+OUTBOX = Outbox(OUTBOX_FILE, SINKS, build_digest_embed)
+
+
+def queue_notifications(events):
+    """알림을 대기열에 추가 (백그라운드에서 묶어서 모든 알림 대상에 전송)"""
+    if not SINKS:
+        print(f"[{datetime.now()}] 알림 대상이 설정되지 않았습니다.")
+        return
 
-    try:
-        response = requests.post(DISCORD_WEBHOOK_URL, json=embed, timeout=10)
-        if response.status_code == 204:
-            print(f"[{datetime.now()}] 알림 전송 완료: {event['movieNm']} @ {event['brchNm']}")
-            return True
-        else:
-            print(f"[{datetime.now()}] 알림 전송 실패: {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"[{datetime.now()}] Discord 전송 오류: {e}")
-        return False
+    OUTBOX.put([
+        (event["id"], f"{event['movieNo']}_{event['brchNo']}_{event['playDe']}", event,
+         f"{event['movieNm']} @ {event['brchNm']}")
+        for event in events
+    ])
+
+
+def send_start_message(event_count):
+    """첫 실행 알림"""
+    if DISCORD_WEBHOOK_URL:
+        test_msg = {
+            "content": f"✅ 메가박스 이벤트 모니터링이 시작되었습니다!\n현재 {event_count}개의 이벤트 상영을 추적 중입니다."
+        }
+        try:
+            SESSION.post(DISCORD_WEBHOOK_URL, json=test_msg, timeout=10)
+        except:
+            pass
+
+
+def load_state():
+    """저장된 이벤트/응답 지문/조회 스케줄 불러오기 + 알림 대기열 전송 시작"""
+    EVENTS.load()
+    RESPONSE_CACHE.load()
+    SCHEDULER.load()
+    if SINKS:
+        OUTBOX.start()
+
+
+def save_state(events_changed=True):
+    """상태 저장 (이벤트 저장소는 변경이 있을 때만 기록)"""
+    if events_changed:
+        EVENTS.save()
+
+    # 응답 지문/조회 스케줄 저장 (지난 날짜 제외)
+    RESPONSE_CACHE.prune(datetime.now().strftime("%Y%m%d"))
+    RESPONSE_CACHE.save()
+    SCHEDULER.prune(datetime.now().strftime("%Y%m%d"))
+    SCHEDULER.save()
+    print(f"[{datetime.now()}] {RESPONSE_CACHE.summary()}")
+    RESPONSE_CACHE.reset_stats()
+
+
+def scan_and_notify(branches, is_first_run):
+    """이벤트 조회 → 새 이벤트 알림 → 이벤트 저장소 갱신
+
+    (current_events, new_events, events_changed)를 반환합니다.
+    """
+    # 이벤트 상영 조회
+    print(f"[{datetime.now()}] 이벤트 상영 조회 중 (14일간)...")
+    if SCAN_ENGINE == "async" and not async_scan.available():
+        print(f"[{datetime.now()}] aiohttp가 없어 스레드 엔진으로 조회합니다.")
+
+    if SCAN_ENGINE == "async" and async_scan.available():
+        current_events = fetch_events_async(branches, days=14)
+    else:
+        current_events = fetch_events(branches, days=14)
+    print(f"[{datetime.now()}] 발견된 이벤트: {len(current_events)}개")
+
+    # 새로운 이벤트 찾기
+    new_ids = EVENTS.unseen(current_events)
+    new_events = [event for event_id, event in current_events.items() if event_id in new_ids]
+
+    print(f"[{datetime.now()}] 새로운 이벤트: {len(new_events)}개")
+
+    # 새 이벤트 알림 보내기 (서울/경기 지역만)
+    if not is_first_run and new_events:
+        queue_notifications([
+            event for event in new_events if event.get("areaCdNm") in TARGET_REGIONS
+        ])
+
+    # 이벤트 저장 (새로 생기거나 바뀐 이벤트만)
+    changed = EVENTS.upsert(current_events)
+
+    # 오래된 이벤트 정리 (30일 이상 지난 이벤트 삭제)
+    cutoff_date = (datetime.now() - timedelta(days=30)).strftime("%Y%m%d")
+    removed = EVENTS.prune(cutoff_date)
+
+    events_changed = bool(changed or removed)
+    return current_events, new_events, events_changed
 
 
 def main():
@@ -255,64 +464,79 @@ def main():
     start_time = time.time()
 
     # 저장된 이벤트 불러오기
-    saved_events = load_saved_events()
-    is_first_run = len(saved_events) == 0
+    load_state()
+    is_first_run = len(EVENTS) == 0
 
     if is_first_run:
         print(f"[{datetime.now()}] 첫 실행 - 기존 이벤트 수집 중...")
+        SCHEDULER.reset()
 
     # 전체 지점 목록 가져오기
     print(f"[{datetime.now()}] 지점 목록 조회 중...")
-    branches = get_all_branches()
+    branches = DIRECTORY.get()
     print(f"[{datetime.now()}] 전체 지점 수: {len(branches)}")
 
     if not branches:
         print(f"[{datetime.now()}] 지점 목록을 가져올 수 없습니다.")
+        OUTBOX.close()
         return
 
-    # 이벤트 상영 조회
-    print(f"[{datetime.now()}] 이벤트 상영 조회 중 (14일간)...")
-    current_events = fetch_events(branches, days=14)
-    print(f"[{datetime.now()}] 발견된 이벤트: {len(current_events)}개")
-
-    # 새로운 이벤트 찾기
-    new_events = []
-    for event_id, event in current_events.items():
-        if event_id not in saved_events:
-            new_events.append(event)
+    current_events, _, _ = scan_and_notify(branches, is_first_run)
+    save_state()
 
-    print(f"[{datetime.now()}] 새로운 이벤트: {len(new_events)}개")
+    elapsed = time.time() - start_time
+    print(f"[{datetime.now()}] 완료! 소요 시간: {elapsed:.1f}초")
 
-    # 새 이벤트 알림 보내기 (서울/경기 지역만)
-    if not is_first_run and new_events:
-        for event in new_events:
-            if event.get("areaCdNm") in TARGET_REGIONS:
-                send_discord_notification(event)
-                time.sleep(0.5)  # Discord rate limit 방지
+    if is_first_run:
+        print(f"[{datetime.now()}] 첫 실행 완료 - {len(current_events)}개 이벤트 저장됨")
+        send_start_message(len(current_events))
 
-    # 이벤트 저장 (기존 + 새로운)
-    saved_events.update(current_events)
+    # 남은 알림 전송 대기 (못 보낸 알림은 다음 실행에서 재전송)
+    OUTBOX.close()
 
-    # 오래된 이벤트 정리 (30일 이상 지난 이벤트 삭제)
-    cutoff_date = (datetime.now() - timedelta(days=30)).strftime("%Y%m%d")
-    saved_events = {k: v for k, v in saved_events.items() if v.get("playDe", "99999999") >= cutoff_date}
 
-    save_events(saved_events)
+def run_daemon(interval=DAEMON_INTERVAL):
+    """상주 모드 - HTTP 연결 풀, 지점 목록, 이벤트 저장소를 유지하고 주기적으로 조회"""
+    print(f"[{datetime.now()}] 메가박스 이벤트 모니터링 시작 (상주 모드, {interval}초 간격)...")
 
-    elapsed = time.time() - start_time
-    print(f"[{datetime.now()}] 완료! 소요 시간: {elapsed:.1f}초")
+    load_state()
+    announced = False
 
-    if is_first_run:
-        print(f"[{datetime.now()}] 첫 실행 완료 - {len(current_events)}개 이벤트 저장됨")
-        if DISCORD_WEBHOOK_URL:
-            test_msg = {
-                "content": f"✅ 메가박스 이벤트 모니터링이 시작되었습니다!\n현재 {len(current_events)}개의 이벤트 상영을 추적 중입니다."
-            }
-            try:
-                requests.post(DISCORD_WEBHOOK_URL, json=test_msg, timeout=10)
-            except:
-                pass
+    try:
+        while True:
+            start_time = time.time()
+
+            branches = DIRECTORY.get()
+            if branches:
+                is_first_run = len(EVENTS) == 0
+                if is_first_run:
+                    SCHEDULER.reset()
+
+                try:
+                    current_events, _, events_changed = scan_and_notify(branches, is_first_run)
+                    save_state(events_changed)
+                except Exception as e:
+                    print(f"[{datetime.now()}] 조회 오류: {e}")
+                else:
+                    if is_first_run and not announced:
+                        send_start_message(len(current_events))
+                        announced = True
+            else:
+                print(f"[{datetime.now()}] 지점 목록을 가져올 수 없습니다.")
+
+            elapsed = time.time() - start_time
+            print(f"[{datetime.now()}] 조회 완료 ({elapsed:.1f}초)")
+
+            # 다음 조회까지 대기 (±20% 지터 - 봇 패턴 회피)
+            time.sleep(max(0, interval * random.uniform(0.8, 1.2) - elapsed))
+    except KeyboardInterrupt:
+        print(f"[{datetime.now()}] 상주 모드 종료 - 상태 저장 중...")
+        save_state()
+        OUTBOX.close()
 
 
 if __name__ == "__main__":
-    main()
+    if "--daemon" in sys.argv:
+        run_daemon()
+    else:
+        main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+알림 대기열(outbox)
+새 이벤트 알림을 파일에 먼저 기록하고 백그라운드 스레드가 알림 대상(sinks.py)으로 보냅니다.
+항목마다 아직 보내지 못한 대상을 기록하고, 모든 대상에 전송한 항목만 대기열에서
+지우므로 웹훅 장애 중에 발견된 알림도 다음 실행(또는 다음 재시도)에서 다시 보내집니다.
+embed는 묶음마다 한 번만 만들고, 모든 대상에 동시에 보냅니다.
+메시지 하나에는 Discord 제한(embed 10개, 글자 수 합계 6000자) 안에서만 담고,
+여러 embed를 담은 메시지가 거부되면 embed를 하나씩 다시 보내 거부된 것만 버립니다.
+
+같은 묶음 키(영화, 극장, 날짜)의 이벤트는 DIGEST_WINDOW초 동안 모았다가
+상영 시간을 모두 나열한 embed 하나로 보냅니다.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from concurrency import backoff_delay
+from discord_notifier import MAX_EMBEDS_PER_MESSAGE, batch_size
+from event_store import atomic_write
+from sinks import FAILED, REJECTED, SENT
+
+# 전송 실패 후 재시도 대기 시간 (초, 지수 백오프 기준값/최댓값)
+OUTBOX_RETRY_BASE_DELAY = 5
+OUTBOX_MAX_RETRY_DELAY = 60
+
+# 같은 묶음의 이벤트를 모으는 시간 (초, 가장 먼저 들어온 알림 기준)
+DIGEST_WINDOW = float(os.environ.get("DIGEST_WINDOW", "5"))
+
+# 실행 종료 시 남은 알림을 보내며 기다릴 최대 시간 (초)
+OUTBOX_DRAIN_TIMEOUT = int(os.environ.get("OUTBOX_DRAIN_TIMEOUT", "60"))
+
+
+def group_entries(entries):
+    """항목을 묶음 키별로 모으기 (처음 나온 순서 유지)"""
+    groups = {}
+    for entry in entries:
+        groups.setdefault(entry["group"], []).append(entry)
+    return list(groups.values())
+
+
+class Outbox:
+    """디스크 알림 대기열 + 백그라운드 전송 스레드
+
+    항목은 {"key": 이벤트 ID, "group": 묶음 키, "event": {...}, "label": 로그용 설명,
+    "queued_at": 추가 시각, "pending": [아직 못 보낸 sink 이름]}입니다.
+    render(events)는 같은 묶음의 이벤트 목록으로 embed 하나를 만듭니다.
+    """
+
+    def __init__(self, path, sinks, render, window=DIGEST_WINDOW):
+        self.path = path
+        self.sinks = sinks
+        self.render = render
+        self.window = window
+        self.entries = []
+        self._cond = threading.Condition()
+        self._worker = None
+        self._pool = None
+        self._closing = False
+        self._stopped = False
+
+    def load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[{datetime.now()}] 알림 대기열 로드 실패 (무시): {e}")
+                self.entries = []
+
+        # 설정에서 빠진 sink는 더 기다리지 않음
+        names = [sink.name for sink in self.sinks]
+        for entry in self.entries:
+            entry["pending"] = [name for name in entry.get("pending", names) if name in names]
+        self.entries = [entry for entry in self.entries if entry["pending"]]
+
+        if self.entries:
+            print(f"[{datetime.now()}] 지난 실행에서 보내지 못한 알림 {len(self.entries)}건")
+        return self
+
+    def _save(self):
+        atomic_write(self.path, json.dumps(self.entries, ensure_ascii=False))
+
+    def start(self):
+        """대기열을 불러오고 전송 스레드 시작"""
+        self.load()
+        self._closing = False
+        self._stopped = False
+        self._pool = ThreadPoolExecutor(max_workers=max(1, len(self.sinks)), thread_name_prefix="outbox-sink")
+        self._worker = threading.Thread(target=self._run, name="outbox-sender", daemon=True)
+        self._worker.start()
+        return self
+
+    def put(self, items):
+        """(key, group, event, label) 목록을 대기열에 추가 (이미 대기 중인 key는 건너뜀)"""
+        now = time.time()
+        names = [sink.name for sink in self.sinks]
+        with self._cond:
+            queued = {entry["key"] for entry in self.entries}
+            for key, group, event, label in items:
+                if key not in queued:
+                    queued.add(key)
+                    self.entries.append({
+                        "key": key, "group": group, "event": event, "label": label,
+                        "queued_at": now, "pending": list(names),
+                    })
+            self._save()
+            self._cond.notify_all()
+
+    @staticmethod
+    def _try_send(sink, embeds):
+        """sink.send - 예외가 나면 로그를 남기고 FAILED (나중에 재전송)"""
+        try:
+            return sink.send(embeds)
+        except Exception as e:
+            print(f"[{datetime.now()}] 알림 전송 오류 ({sink.name}): {e}")
+            return FAILED
+
+    @classmethod
+    def _send(cls, sink, embeds, indexes):
+        """sink 하나에 묶음 전송 - [(묶음 번호, 결과), ...] 반환
+
+        여러 embed를 담은 메시지가 거부되면 어느 embed 때문인지 알 수 없으므로
+        하나씩 다시 보내고, 그래도 거부된 embed만 REJECTED로 돌려줍니다.
+        """
+        status = cls._try_send(sink, [embeds[i] for i in indexes])
+        if status != REJECTED or len(indexes) == 1:
+            return [(i, status) for i in indexes]
+        print(f"[{datetime.now()}] 알림 묶음 거부됨 ({sink.name}) - {len(indexes)}건을 하나씩 재전송")
+        return [(i, cls._try_send(sink, [embeds[i]])) for i in indexes]
+
+    def __len__(self):
+        with self._cond:
+            return len(self.entries)
+
+    def _run(self):
+        failures = 0
+        while True:
+            with self._cond:
+                # 가장 오래된 알림이 묶음 시간을 채울 때까지 대기 (종료 중이면 바로 전송)
+                while True:
+                    if not self.entries:
+                        if self._closing:
+                            return
+                        self._cond.wait()
+                        continue
+                    wait = self.entries[0]["queued_at"] + self.window - time.time()
+                    if wait <= 0 or self._closing:
+                        break
+                    self._cond.wait(timeout=wait)
+                groups = group_entries(self.entries)[:MAX_EMBEDS_PER_MESSAGE]
+
+            # 묶음별 embed는 한 번만 만들고 모든 sink에서 재사용 (만들지 못한 묶음은 실패로 보고 재시도)
+            rendered = []
+            render_failed = False
+            for group in groups:
+                try:
+                    rendered.append((group, self.render([entry["event"] for entry in group])))
+                except Exception as e:
+                    render_failed = True
+                    print(f"[{datetime.now()}] 알림 embed 생성 오류 ({group[0]['label']}): {e}")
+
+            # 글자 수 제한을 넘는 나머지 묶음은 다음 메시지로
+            rendered = rendered[:batch_size([embed for _, embed in rendered])]
+            groups = [group for group, _ in rendered]
+            embeds = [embed for _, embed in rendered]
+
+            # sink마다 아직 못 보낸 묶음만 동시에 전송 (close()가 전송 풀을 닫았으면 종료)
+            with self._cond:
+                if self._stopped:
+                    return
+                jobs = []
+                for sink in self.sinks:
+                    indexes = [i for i, group in enumerate(groups) if any(sink.name in entry["pending"] for entry in group)]
+                    if indexes:
+                        jobs.append((sink, self._pool.submit(self._send, sink, embeds, indexes)))
+            results = [(sink, future.result()) for sink, future in jobs]
+
+            with self._cond:
+                for sink, statuses in results:
+                    for i, status in statuses:
+                        if status == FAILED:
+                            continue
+                        for entry in groups[i]:
+                            if sink.name in entry["pending"]:
+                                entry["pending"].remove(sink.name)
+                self.entries = [entry for entry in self.entries if entry["pending"]]
+                try:
+                    self._save()
+                except OSError as e:
+                    # 파일에 못 남겨도 메모리의 대기열로 계속 전송
+                    print(f"[{datetime.now()}] 알림 대기열 저장 실패: {e}")
+
+                for sink, statuses in results:
+                    for i, status in statuses:
+                        for entry in groups[i]:
+                            if status == SENT:
+                                print(f"[{datetime.now()}] 알림 전송 완료 ({sink.name}): {entry['label']}")
+                            elif status == REJECTED:
+                                print(f"[{datetime.now()}] 알림 거부됨 ({sink.name}, 삭제): {entry['label']}")
+
+                if render_failed or any(status == FAILED for _, statuses in results for _, status in statuses):
+                    failures += 1
+                    if self._closing:
+                        return
+                    # 재시도 전 대기 (종료 요청이 오면 바로 깨어남)
+                    self._cond.wait(timeout=min(OUTBOX_MAX_RETRY_DELAY, backoff_delay(failures, base=OUTBOX_RETRY_BASE_DELAY)))
+                else:
+                    failures = 0
+
+    def close(self, timeout=OUTBOX_DRAIN_TIMEOUT):
+        """남은 알림을 timeout초까지 보내고 종료 (못 보낸 알림은 파일에 남음)"""
+        if self._worker is None:
+            return
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._worker.join(timeout)
+        with self._cond:
+            # 시간 안에 못 끝났으면 진행 중인 전송 결과만 기록하고 새 전송은 하지 않음
+            self._stopped = True
+            self._pool.shutdown(wait=False)
+        self._worker = None
+        remaining = len(self)
+        if remaining:
+            print(f"[{datetime.now()}] 보내지 못한 알림 {remaining}건 - 다음 실행에서 재전송")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+(영화관, 날짜) 단위 조회 주기 스케줄러
+가까운 날짜는 매 실행마다, 먼 날짜는 더 긴 간격으로 조회합니다.
+다음 조회 시각을 우선순위 큐(heap)로 관리해서 이번 실행에 조회할 항목만 꺼냅니다.
+"""
+
+import heapq
+import json
+import os
+import time
+from datetime import datetime
+
+from event_store import atomic_write
+
+# (오늘부터 며칠 후까지, 조회 간격 초)
+REFRESH_TIERS = [
+    (3, 0),          # 오늘 ~ +3일: 매 실행
+    (7, 30 * 60),    # +4 ~ +7일: 30분마다
+    (None, 60 * 60), # 그 이후: 1시간마다
+]
+
+
+def refresh_interval(day_offset, tiers=REFRESH_TIERS):
+    """오늘로부터 day_offset일 후 날짜의 조회 간격(초)"""
+    for max_offset, interval in tiers:
+        if max_offset is None or day_offset <= max_offset:
+            return interval
+    return tiers[-1][1]
+
+
+class PollScheduler:
+    """파티션별 다음 조회 시각 저장소"""
+
+    def __init__(self, path, tiers=REFRESH_TIERS):
+        self.path = path
+        self.tiers = tiers
+        self.entries = {}
+        self._pending = {}
+
+    def load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[{datetime.now()}] 조회 스케줄 로드 실패 (전체 조회): {e}")
+                self.entries = {}
+        return self
+
+    def save(self):
+        atomic_write(self.path, json.dumps(self.entries, ensure_ascii=False, separators=(",", ":")))
+
+    def reset(self):
+        self.entries = {}
+
+    def due(self, partitions, now=None):
+        """이번 실행에 조회할 파티션 목록
+
+        partitions: (key, date, day_offset, task) 목록. 다음 조회 시각이 지난
+        파티션의 task를 오래 밀린 순서대로 반환합니다.
+        """
+        now = time.time() if now is None else now
+        heap = []
+        for i, (key, date, day_offset, task) in enumerate(partitions):
+            next_due = self.entries.get(key, {}).get("next", 0)
+            heap.append((next_due, i, key, date, day_offset, task))
+        heapq.heapify(heap)
+
+        tasks = []
+        while heap and heap[0][0] <= now:
+            _, _, key, date, day_offset, task = heapq.heappop(heap)
+            self._pending[key] = (date, refresh_interval(day_offset, self.tiers))
+            tasks.append(task)
+        return tasks
+
+    def mark(self, key, now=None):
+        """조회 성공 - 다음 조회 시각 갱신 (실패한 파티션은 다음 실행에 다시 조회)"""
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        date, interval = pending
+        now = time.time() if now is None else now
+        self.entries[key] = {"date": date, "next": now + interval}
+
+    def prune(self, cutoff_date):
+        """cutoff_date 이전 날짜의 항목 삭제"""
+        self.entries = {k: v for k, v in self.entries.items() if v["date"] >= cutoff_date}
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+상영 조회 응답 지문(fingerprint) 캐시
+(영화관, 날짜) 응답 바이트의 해시가 지난 실행과 같으면 JSON 디코딩과
+이벤트 추출을 건너뛰고 지난번에 추출한 이벤트를 그대로 사용합니다.
+해시에는 파서/분류기 버전도 넣어서, 추출 방식이 바뀌면 같은 응답도 다시 추출합니다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+from event_store import atomic_write
+
+
+def fingerprint(content, version=""):
+    """추출 방식 버전 + 응답 바이트 해시"""
+    digest = hashlib.blake2b(version.encode("utf-8") + b"\0", digest_size=16)
+    digest.update(content)
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """(영화관, 날짜)별 응답 해시와 추출된 이벤트 저장소
+
+    version은 파서/분류기 버전 - 바뀌면 지난 실행의 항목은 모두 변경으로 처리됩니다.
+    """
+
+    def __init__(self, path, version=""):
+        self.path = path
+        self.version = version
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[{datetime.now()}] 응답 캐시 로드 실패 (무시): {e}")
+                self.entries = {}
+        return self
+
+    def save(self):
+        atomic_write(self.path, json.dumps(self.entries, ensure_ascii=False, separators=(",", ":")))
+
+    def extract(self, key, date, content, parse):
+        """응답에서 이벤트 추출 (해시가 같으면 캐시된 이벤트 재사용)
+
+        parse는 디코딩된 JSON을 받아 {event_id: event}를 반환합니다.
+        JSON이 아닌 응답이면 ValueError가 그대로 전달됩니다.
+        """
+        digest = fingerprint(content, self.version)
+        entry = self.entries.get(key)
+
+        if entry and entry["hash"] == digest:
+            with self._lock:
+                self.hits += 1
+            return entry["events"]
+
+        events = parse(json.loads(content))
+        with self._lock:
+            self.entries[key] = {"date": date, "hash": digest, "events": events}
+            self.misses += 1
+        return events
+
+    def prune(self, cutoff_date):
+        """cutoff_date 이전 날짜의 항목 삭제"""
+        self.entries = {k: v for k, v in self.entries.items() if v["date"] >= cutoff_date}
+
+    def reset_stats(self):
+        """실행(조회 주기)별 통계 초기화"""
+        self.hits = 0
+        self.misses = 0
+
+    def summary(self):
+        return f"응답 캐시: 변경 없음 {self.hits}건, 변경/신규 {self.misses}건"
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+알림 전송 대상(sink)
+Discord 웹훅 외에 Slack 호환 웹훅, 파일/표준출력으로도 알림을 보냅니다.
+sink마다 HTTP 연결 풀과 동시 전송 수 제한을 따로 두고, outbox가 같은 embed를
+모든 sink에 동시에 보냅니다.
+
+설정 (모니터의 DISCORD_WEBHOOK_URL은 항상 첫 번째 sink):
+    NOTIFY_SINKS="discord:https://discord.com/api/webhooks/...,slack:https://hooks.slack.com/...,file:-"
+    file:- 는 표준출력, file:<경로>는 JSON Lines 파일에 추가합니다.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from concurrency import backoff_delay
+from discord_notifier import MAX_ATTEMPTS, DiscordNotifier
+from http_session import create_session
+
+# 추가 전송 대상 목록
+NOTIFY_SINKS = os.environ.get("NOTIFY_SINKS", "")
+
+# 전송 결과
+SENT = "sent"
+REJECTED = "rejected"  # 메시지가 잘못되어 다시 보내도 실패 (대기열에서 삭제)
+FAILED = "failed"      # 일시적 실패 (나중에 재전송)
+
+
+class DiscordSink:
+    """Discord 웹훅 (rate limit 버킷이 웹훅마다 하나라서 기본 동시 전송 1)"""
+
+    def __init__(self, name, url, max_concurrency=1):
+        self.name = name
+        self.notifier = DiscordNotifier(create_session(pool_size=max_concurrency), url)
+        self._slots = threading.Semaphore(max_concurrency)
+
+    def send(self, embeds):
+        with self._slots:
+            if self.notifier.post({"embeds": embeds}):
+                return SENT
+            return REJECTED if self.notifier.last_status == 400 else FAILED
+
+
+def embed_to_attachment(embed):
+    """Discord embed → Slack attachment"""
+    attachment = {
+        "color": f"#{embed.get('color', 0):06x}",
+        "title": embed.get("title", ""),
+        "title_link": embed.get("url"),
+        "text": embed.get("description", ""),
+        "fields": [
+            {"title": field["name"], "value": field["value"], "short": field.get("inline", False)}
+            for field in embed.get("fields", [])
+        ],
+        "footer": embed.get("footer", {}).get("text"),
+        "thumb_url": embed.get("thumbnail", {}).get("url"),
+    }
+    return {k: v for k, v in attachment.items() if v is not None}
+
+
+class SlackSink:
+    """Slack 호환 수신 웹훅 (attachments 형식)"""
+
+    def __init__(self, name, url, max_concurrency=2, max_attempts=MAX_ATTEMPTS):
+        self.name = name
+        self.url = url
+        self.session = create_session(pool_size=max_concurrency)
+        self.max_attempts = max_attempts
+        self._slots = threading.Semaphore(max_concurrency)
+
+    def send(self, embeds):
+        payload = {"attachments": [embed_to_attachment(embed) for embed in embeds]}
+        with self._slots:
+            for attempt in range(self.max_attempts):
+                try:
+                    response = self.session.post(self.url, json=payload, timeout=10)
+                except Exception as e:
+                    print(f"[{datetime.now()}] {self.name} 전송 오류: {e}")
+                    time.sleep(backoff_delay(attempt))
+                    continue
+
+                if response.status_code == 200:
+                    return SENT
+                if response.status_code == 429:
+                    time.sleep(float(response.headers.get("Retry-After", 1)))
+                    continue
+                if response.status_code >= 500:
+                    time.sleep(backoff_delay(attempt))
+                    continue
+
+                print(f"[{datetime.now()}] {self.name} 전송 실패: {response.status_code}")
+                return REJECTED if response.status_code == 400 else FAILED
+        return FAILED
+
+
+class FileSink:
+    """표준출력(-) 또는 JSON Lines 파일"""
+
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, embeds):
+        lines = "".join(json.dumps(embed, ensure_ascii=False) + "\n" for embed in embeds)
+        with self._lock:
+            if self.path == "-":
+                sys.stdout.write(lines)
+                sys.stdout.flush()
+            else:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(lines)
+        return SENT
+
+
+SINK_TYPES = {
+    "discord": DiscordSink,
+    "slack": SlackSink,
+    "file": FileSink,
+}
+
+
+def build_sinks(discord_webhook_url, spec=NOTIFY_SINKS):
+    """모니터의 Discord 웹훅 + NOTIFY_SINKS로 sink 목록 생성
+
+    sink 이름(discord, discord2, slack, ...)은 outbox 파일에 전송 상태로 기록되므로
+    설정 순서가 바뀌지 않는 한 실행 간에 유지됩니다.
+    """
+    sinks = []
+    counts = {}
+
+    def add(kind, target):
+        counts[kind] = counts.get(kind, 0) + 1
+        name = kind if counts[kind] == 1 else f"{kind}{counts[kind]}"
+        sinks.append(SINK_TYPES[kind](name, target))
+
+    if discord_webhook_url:
+        add("discord", discord_webhook_url)
+
+    for item in spec.replace("\n", ",").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        kind, _, target = item.partition(":")
+        if kind not in SINK_TYPES or not target:
+            print(f"[{datetime.now()}] 알 수 없는 알림 대상 (무시): {kind}")
+            continue
+        add(kind, target)
+
+    return sinks
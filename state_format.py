@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+압축 이벤트 상태 형식 (EVENT_FORMAT=packed)
+{event_id: event}를 필드 이름 목록(스키마)은 한 번만, 각 이벤트는 값 목록으로만
+직렬화한 뒤 압축합니다. msgpack/zstandard가 설치되어 있으면 사용하고, 없으면
+표준 라이브러리(JSON/zlib)로 같은 구조를 저장합니다.
+
+파일 헤더: b"TMEV" + 버전(1바이트) + 직렬화 코덱(b"m"/b"j") + 압축 코덱(b"z"/b"d")
+"""
+
+import gc
+import json
+import zlib
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+MAGIC = b"TMEV"
+VERSION = 1
+ZSTD_LEVEL = 6
+ZLIB_LEVEL = 6
+
+
+def codecs():
+    """현재 환경에서 쓸 (직렬화, 압축) 코덱"""
+    return (b"m" if msgpack else b"j"), (b"z" if zstandard else b"d")
+
+
+def to_tables(events):
+    """{event_id: event} → [[필드 목록, [event_id, ...], [[값, ...], ...]], ...]
+
+    필드 구성이 같은 이벤트끼리 한 표로 묶으므로 필드 순서까지 그대로 복원됩니다.
+    """
+    tables = {}
+    for event_id, event in events.items():
+        ids, rows = tables.setdefault(tuple(event), ([], []))
+        ids.append(event_id)
+        rows.append(list(event.values()))
+    return [[list(keys), ids, rows] for keys, (ids, rows) in tables.items()]
+
+
+def from_tables(tables):
+    events = {}
+    for keys, ids, rows in tables:
+        events.update(zip(ids, [dict(zip(keys, row)) for row in rows]))
+    return events
+
+
+def pack_events(events):
+    """이벤트 맵을 압축 바이트로 변환"""
+    serializer, compressor = codecs()
+    tables = to_tables(events)
+
+    if serializer == b"m":
+        body = msgpack.packb(tables, use_bin_type=True)
+    else:
+        body = json.dumps(tables, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    if compressor == b"z":
+        body = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    else:
+        body = zlib.compress(body, ZLIB_LEVEL)
+
+    return MAGIC + bytes([VERSION]) + serializer + compressor + body
+
+
+def unpack_events(data):
+    """pack_events로 만든 바이트를 이벤트 맵으로 복원"""
+    if data[:4] != MAGIC or data[4] != VERSION:
+        raise ValueError("압축 이벤트 파일 형식이 아닙니다.")
+    serializer, compressor, body = data[5:6], data[6:7], data[7:]
+
+    if compressor == b"z":
+        if zstandard is None:
+            raise RuntimeError("zstandard가 설치되어 있지 않아 파일을 읽을 수 없습니다.")
+        body = zstandard.ZstdDecompressor().decompress(body)
+    else:
+        body = zlib.decompress(body)
+
+    if serializer == b"m" and msgpack is None:
+        raise RuntimeError("msgpack이 설치되어 있지 않아 파일을 읽을 수 없습니다.")
+
+    # 수십만 개의 dict/list를 한 번에 만들 때 순환 GC가 반복 실행되지 않도록 잠시 중지
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        if serializer == b"m":
+            tables = msgpack.unpackb(body, raw=False)
+        else:
+            tables = json.loads(body)
+        return from_tables(tables)
+    finally:
+        if gc_enabled:
+            gc.enable()
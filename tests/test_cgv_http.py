@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+cgv_http 요청 재전송 테스트
+브라우저에서 기록한 요청을 로컬 시간표 서버로 다시 보내 이벤트를 찾는지 확인합니다.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cgv_http  # noqa: E402
+
+
+def schedule_payload(play_ymd):
+    return {"data": [{
+        "movNm": "테스트 영화",
+        "scnYmd": play_ymd,
+        "showtimes": [
+            {"scnsrtTm": "1740", "evntNm": "무대인사"},
+            {"scnsrtTm": "2010", "evntNm": ""},
+        ],
+    }]}
+
+
+class ScheduleHandler(BaseHTTPRequestHandler):
+    """요청한 상영일의 시간표를 돌려주는 CGV 시간표 API 흉내
+
+    브라우저처럼 br/zstd를 받겠다고 하면 requests가 풀 수 없는 압축 본문으로 응답합니다.
+    쿠키 ctx가 요청의 X-Ctx 토큰과 다르거나 다른 극장 응답의 쿠키(seen)가 섞이면 403입니다.
+    응답 본문은 극장 코드별 payloads(상영일 → JSON), 없으면 schedule_payload입니다.
+    """
+
+    payloads = {}
+
+    def do_GET(self):
+        encoding = self.headers.get("Accept-Encoding", "")
+        query = parse_qs(urlparse(self.path).query)
+        theater_code = query["theaterCd"][0]
+        cookies = SimpleCookie(self.headers.get("Cookie", ""))
+        ctx = cookies["ctx"].value if "ctx" in cookies else None
+        seen = cookies["seen"].value if "seen" in cookies else theater_code
+        if ctx != self.headers.get("X-Ctx") or seen != theater_code:
+            body = b"forbidden"
+            self.send_response(403)
+            self.send_header("Content-Type", "text/plain")
+        elif "br" in encoding or "zstd" in encoding:
+            body = b"\x8b\x02\x80compressed"
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Encoding", "br")
+        else:
+            payload = self.payloads.get(theater_code, schedule_payload)(query["playYmd"][0])
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Set-Cookie", f"seen={theater_code}; Path=/")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class CgvHttpClientTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), ScheduleHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.client = cgv_http.CgvHttpClient(os.path.join(self.tmpdir.name, "cgv_session.json"), days=7).load()
+
+    def captured_template(self, theater_code="0013", ctx="a"):
+        """브라우저 컨텍스트 ctx가 보낸 그대로의 헤더/쿠키로 기록한 요청"""
+        template = cgv_http.make_template(
+            "GET", f"{self.base_url}/cnm/atkt/searchSchdList?theaterCd={theater_code}&playYmd=20261017",
+            {
+                "accept": "application/json, text/plain, */*",
+                "accept-encoding": "gzip, deflate, br, zstd",
+                "cookie": f"ctx={ctx}",
+                "x-ctx": ctx,
+                ":authority": "www.cgv.co.kr",
+            },
+            None, "2026-10-17",
+        )
+        template["cookies"] = cgv_http.cookie_records([
+            {"name": "ctx", "value": ctx, "domain": "127.0.0.1", "path": "/", "httpOnly": True},
+        ])
+        return template
+
+    def test_template_drops_browser_only_headers(self):
+        template = self.captured_template()
+        self.assertEqual(template["date"], "20261017")
+        self.assertEqual(template["date_format"], "%Y%m%d")
+        self.assertEqual(set(template["headers"]), {"accept", "x-ctx"})
+
+    def test_replay_captured_template(self):
+        self.client.update({"용산아이파크몰": self.captured_template()})
+        greetings, missing = self.client.scan([("서울", "용산아이파크몰")])
+
+        self.assertEqual(missing, [])
+        self.assertTrue(greetings)
+        self.assertEqual({g["time"] for g in greetings}, {"17:40"})
+        self.assertEqual({g["event_type"] for g in greetings}, {"무대인사"})
+        self.assertTrue(os.path.exists(self.client.path))
+
+    def test_templates_replay_their_own_context_cookies(self):
+        self.client.update({
+            "용산아이파크몰": self.captured_template("0013", "a"),
+            "강변": self.captured_template("0056", "b"),
+        })
+        # 앞 극장 응답의 쿠키(seen)가 뒤 극장 요청에 섞이지 않아야 함
+        for theater in ("용산아이파크몰", "강변"):
+            greetings, missing = self.client.scan([("서울", theater)])
+            self.assertEqual(missing, [])
+            self.assertTrue(greetings)
+
+    def test_session_file_keeps_cookies_per_template(self):
+        self.client.update({"강변": self.captured_template("0056", "b")})
+        loaded = cgv_http.CgvHttpClient(self.client.path).load()
+        self.assertEqual(loaded.templates["강변"]["cookies"],
+                         [{"name": "ctx", "value": "b", "domain": "127.0.0.1", "path": "/"}])
+        self.assertEqual(loaded.scan([("서울", "강변")])[1], [])
+
+    def scan_with(self, payload):
+        """극장 코드 0099가 payload(상영일 → JSON)로 응답할 때의 조회 결과"""
+        ScheduleHandler.payloads["0099"] = payload
+        self.addCleanup(ScheduleHandler.payloads.clear)
+        self.client.update({"여의도": self.captured_template("0099", "c")})
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            result = self.client.scan([("서울", "여의도")])
+        return result, output.getvalue()
+
+    def test_unrecognized_rows_fall_back_to_browser(self):
+        (greetings, missing), log = self.scan_with(lambda play_ymd: {"result": [{"title": "테스트 영화", "begin": "17:40"}]})
+        self.assertEqual(greetings, [])
+        self.assertEqual(missing, [("서울", "여의도")])
+        self.assertIn("상영 행을 찾지 못함", log)
+
+    def test_empty_day_before_an_open_day_falls_back_to_browser(self):
+        first = cgv_http.weekend_dates(7)[0].strftime("%Y%m%d")
+        (_, missing), _ = self.scan_with(lambda play_ymd: {"data": []} if play_ymd == first else schedule_payload(play_ymd))
+        self.assertEqual(missing, [("서울", "여의도")])
+
+    def test_dates_not_yet_open_are_not_failures(self):
+        first = cgv_http.weekend_dates(7)[0].strftime("%Y%m%d")
+        (greetings, missing), _ = self.scan_with(lambda play_ymd: schedule_payload(play_ymd) if play_ymd == first else {"data": []})
+        self.assertEqual(missing, [])
+        self.assertEqual(len(greetings), 1)
+
+    def test_missing_template_falls_back_to_browser(self):
+        greetings, missing = self.client.scan([("서울", "강변")])
+        self.assertEqual(greetings, [])
+        self.assertEqual(missing, [("서울", "강변")])
+
+
+if __name__ == "__main__":
+    unittest.main()
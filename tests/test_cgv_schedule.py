@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+cgv_schedule 시간표 JSON 해석 테스트
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cgv_schedule  # noqa: E402
+from cgv_browser import ScheduleCapture  # noqa: E402
+from cgv_schedule import build_greetings, greeting_key, schedule_events  # noqa: E402
+from event_store import GreetingHistory  # noqa: E402
+
+
+def schedule(play_ymd, *rows):
+    return {"data": [{"movNm": "테스트 영화", "scnYmd": play_ymd, "showtimes": list(rows)}]}
+
+
+class ScheduleEventsTest(unittest.TestCase):
+    def test_rows_of_play_date(self):
+        found, events = schedule_events([schedule("20261017", {"scnsrtTm": "1740", "evntNm": "무대인사"})], "2026-10-17")
+        self.assertTrue(found)
+        self.assertEqual(events, [{"movie": "테스트 영화", "time": "17:40", "eventType": "무대인사"}])
+
+    def test_other_date_falls_back_to_page_text(self):
+        found, events = schedule_events([schedule("20261018", {"scnsrtTm": "1740", "evntNm": "무대인사"})], "2026-10-17")
+        self.assertFalse(found)
+        self.assertEqual(events, [])
+
+    def test_undated_rows_fall_back_to_page_text(self):
+        payload = {"movNm": "테스트 영화", "showtimes": [{"scnsrtTm": "1740", "evntNm": "시네마톡"}]}
+        self.assertEqual(schedule_events([payload], "2026-10-17"), (False, []))
+        self.assertTrue(schedule_events([payload])[0])
+
+    def test_undated_rows_take_the_requested_date(self):
+        payload = {"movNm": "테스트 영화", "showtimes": [{"scnsrtTm": "1740", "evntNm": "시네마톡"}]}
+        found, events = schedule_events([payload], "2026-10-17", request_date="2026-10-17")
+        self.assertTrue(found)
+        self.assertEqual([e["eventType"] for e in events], ["시네마톡"])
+
+
+class GreetingIdTest(unittest.TestCase):
+    def test_api_and_page_text_give_the_same_id(self):
+        play_day = date(2026, 10, 17)
+        api = build_greetings("강변", play_day, [{"movie": "왕과 사는 남자 (자막)", "time": "0930", "eventType": "무대인사"}])
+        page = build_greetings("강변", play_day, [{"movie": "왕과 사는 남자", "time": "9:30", "eventType": "무대인사"}])
+        self.assertEqual(api[0]["id"], page[0]["id"])
+        self.assertEqual(api[0]["time"], "09:30")
+
+    def test_history_matches_greetings_saved_with_old_ids(self):
+        old = {"movie": "왕과 사는 남자", "theater": "CGV 강변", "date": "10월 17일 (토)", "time": "9:30",
+               "hall": "", "id": "강변_2026_10_17_9:30_왕과 사는 남자"}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "stage_greetings.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"greetings": [old]}, f, ensure_ascii=False)
+            history = GreetingHistory(path, key=greeting_key).load()
+
+        new = build_greetings("강변", date(2026, 10, 17), [{"movie": "왕과 사는 남자", "time": "09:30"}])
+        self.assertEqual(history.add(new), [])
+
+
+class ReportUnparsedTest(unittest.TestCase):
+    def report(self, payloads):
+        output = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmpdir, mock.patch.object(cgv_schedule, "DUMP_DIR", tmpdir), \
+                contextlib.redirect_stdout(output):
+            cgv_schedule.report_unparsed(payloads, "2026-10-17", "HTTP 강변")
+            dumps = []
+            for name in os.listdir(tmpdir):
+                with open(os.path.join(tmpdir, name), encoding="utf-8") as f:
+                    dumps.append(json.load(f))
+        return output.getvalue(), dumps
+
+    def test_unknown_fields_are_logged_and_dumped(self):
+        payload = {"result": [{"title": "테스트 영화", "begin": "17:40"}]}
+        log, dumps = self.report([payload])
+        self.assertIn("상영 행을 찾지 못함", log)
+        self.assertIn("result[].title", log)
+        self.assertEqual(dumps, [[payload]])
+
+    def test_rows_of_other_dates_are_listed(self):
+        log, _ = self.report([schedule("20261018", {"scnsrtTm": "1740"})])
+        self.assertIn("2026-10-18", log)
+
+
+class ScheduleCaptureTest(unittest.TestCase):
+    def capture(self, *responses):
+        capture = ScheduleCapture(SimpleNamespace(on=lambda event, handler: None))
+        capture.responses = [(SimpleNamespace(url=url, post_data=None), payload) for url, payload in responses]
+        return capture
+
+    def test_undated_rows_of_a_dated_request(self):
+        payload = {"movNm": "테스트 영화", "showtimes": [{"scnsrtTm": "1740", "evntNm": "무대인사"}]}
+        capture = self.capture(("https://api.cgv.co.kr/cnm/atkt/searchSchdList?playYmd=20261017", payload))
+        events = asyncio.run(capture.events("2026-10-17", "강변"))
+        self.assertEqual(events, [{"movie": "테스트 영화", "time": "17:40", "eventType": "무대인사"}])
+
+    def test_unparsed_responses_fall_back_with_a_log(self):
+        capture = self.capture(("https://api.cgv.co.kr/cnm/atkt/searchSchdList?playYmd=20261017", {"result": []}))
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertIsNone(asyncio.run(capture.events("2026-10-17", "강변")))
+        self.assertIn("2026-10-17 상영 없음", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
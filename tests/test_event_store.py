@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+event_store 저장소 테스트 (임시 디렉터리의 파일로 저장/불러오기 확인)
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_store import (  # noqa: E402
+    IndexedEventStore, JournalEventStore, JsonEventStore, SeenIndex, SqliteEventStore,
+    dump_json_events, id_hash, load_json_events,
+)
+
+
+def event(play_date, seats=100):
+    return {"movie": "테스트 영화", "playDate": play_date, "seats": seats}
+
+
+class StoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+
+class JournalEventStoreTest(StoreTestCase):
+    def open(self, compact_bytes=1024 * 1024):
+        store = JournalEventStore(self.path("events.json"), "playDate", compact_bytes=compact_bytes)
+        with contextlib.redirect_stdout(io.StringIO()) as self.log:
+            return store.load()
+
+    def journal_lines(self, store):
+        with open(store.journal_path, encoding="utf-8") as f:
+            return f.read().splitlines()
+
+    def test_changes_are_appended_and_replayed(self):
+        store = self.open()
+        with contextlib.redirect_stdout(io.StringIO()):
+            store.save()
+        store.upsert({"a": event("2026-10-16"), "b": event("2026-10-18")})
+        store.save()
+        store = self.open()
+        store.upsert({"b": event("2026-10-18", seats=50)})
+        store.prune("2026-10-17")
+        store.save()
+
+        # 첫 저장에서 만든 스냅샷 뒤로는 변경분만 저널에 쌓임
+        self.assertEqual(len(self.journal_lines(store)), 4)
+        self.assertEqual(load_json_events(store.path), {})
+        self.assertEqual(self.open().export(), {"b": event("2026-10-18", seats=50)})
+
+    def test_truncated_last_line_is_skipped_and_compacted(self):
+        store = self.open()
+        with contextlib.redirect_stdout(io.StringIO()):
+            store.save()
+        store.upsert({"a": event("2026-10-17"), "b": event("2026-10-18")})
+        store.save()
+        # 두 번째 줄을 쓰는 중에 종료
+        with open(store.journal_path, "r+", encoding="utf-8") as f:
+            text = f.read()
+            f.seek(0)
+            f.truncate()
+            f.write(text[:-10])
+
+        store = self.open()
+        self.assertIn("잘려 있어 건너뜁니다", self.log.getvalue())
+        self.assertEqual(set(store.export()), {"a"})
+        self.assertEqual(self.journal_lines(store), [])
+        self.assertEqual(set(load_json_events(store.path)), {"a"})
+
+        # 압축 후에 덧붙인 변경도 다시 읽힘
+        store.upsert({"c": event("2026-10-19")})
+        store.save()
+        self.assertEqual(set(self.open().export()), {"a", "c"})
+
+    def test_large_journal_is_compacted(self):
+        store = self.open(compact_bytes=200)
+        with contextlib.redirect_stdout(io.StringIO()):
+            store.save()
+        store.upsert({"a": event("2026-10-17")})
+        store.save()
+        self.assertEqual(len(self.journal_lines(store)), 1)
+
+        store.upsert({f"id{i}": event("2026-10-17") for i in range(5)})
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            store.save()
+        self.assertIn("저널 압축 완료: 6개 이벤트", output.getvalue())
+        self.assertEqual(self.journal_lines(store), [])
+        self.assertEqual(len(load_json_events(store.path)), 6)
+        self.assertEqual(len(self.open().export()), 6)
+
+    def test_kill_during_compaction_replays_to_same_state(self):
+        store = self.open()
+        with contextlib.redirect_stdout(io.StringIO()):
+            store.save()
+        store.upsert({"a": event("2026-10-17")})
+        store.save()
+        store.prune("2026-10-18")
+        store.save()
+
+        # 스냅샷은 교체했지만 저널을 비우기 전에 종료
+        dump_json_events(store.path, store.events)
+        self.assertEqual(len(self.journal_lines(store)), 2)
+        self.assertEqual(self.open().export(), {})
+
+
+class SqliteEventStoreTest(StoreTestCase):
+    def open(self, import_from=None):
+        store = SqliteEventStore(self.path("events.db"), "playDate", import_from=import_from)
+        with contextlib.redirect_stdout(io.StringIO()):
+            store.load()
+        self.addCleanup(store.conn.close)
+        return store
+
+    def test_upsert_counts_only_new_or_changed_rows(self):
+        store = self.open()
+        self.assertEqual(store.upsert({"a": event("2026-10-17"), "b": event("2026-10-18")}), 2)
+        self.assertEqual(store.upsert({"a": event("2026-10-17"), "b": event("2026-10-18", seats=50)}), 1)
+        self.assertEqual(store.unseen(["a", "b", "c"]), {"c"})
+        self.assertEqual(store.export()["b"]["seats"], 50)
+
+    def test_changed_play_date_is_used_by_prune(self):
+        store = self.open()
+        store.upsert({"a": event("2026-10-18")})
+        store.upsert({"a": event("2026-10-16")})
+        self.assertEqual(store.prune("2026-10-17"), 1)
+        self.assertEqual(len(store), 0)
+
+    def test_prune_and_commit(self):
+        store = self.open()
+        store.upsert({"a": event("2026-10-16"), "b": event("2026-10-17"), "c": {"movie": "날짜 없음"}})
+        self.assertEqual(store.prune("2026-10-17"), 1)
+        store.save()
+
+        store = self.open()
+        self.assertEqual(set(store.export()), {"b", "c"})
+
+    def test_uncommitted_changes_are_dropped(self):
+        store = self.open()
+        store.upsert({"a": event("2026-10-17")})
+        store.save()
+        store.upsert({"b": event("2026-10-17")})
+        store.conn.close()
+
+        self.assertEqual(set(self.open().export()), {"a"})
+
+    def test_unseen_queries_in_chunks(self):
+        store = self.open()
+        store.upsert({f"id{i}": event("2026-10-17") for i in range(0, 1200, 2)})
+        self.assertEqual(store.unseen(f"id{i}" for i in range(1200)), {f"id{i}" for i in range(1, 1200, 2)})
+
+    def test_first_load_imports_json_file(self):
+        dump_json_events(self.path("events.json"), {"a": event("2026-10-17")})
+        store = self.open(import_from=self.path("events.json"))
+        self.assertEqual(store.export(), {"a": event("2026-10-17")})
+
+        # 두 번째부터는 DB만 사용
+        dump_json_events(self.path("events.json"), {"b": event("2026-10-17")})
+        self.assertEqual(set(self.open(import_from=self.path("events.json")).export()), {"a"})
+
+
+class IndexedEventStoreTest(StoreTestCase):
+    def open(self):
+        return IndexedEventStore(JsonEventStore(self.path("events.json"), "playDate"), self.path("events.seen")).load()
+
+    def test_index_only_keeps_seen_ids(self):
+        store = self.open()
+        self.assertEqual(store.upsert({"a": event("2026-10-17"), "b": event("2026-10-18")}), 2)
+        store.save()
+
+        store = self.open()
+        self.assertEqual(len(store), 2)
+        self.assertFalse(store._records_loaded)
+        self.assertEqual(store.unseen(["a", "b", "c"]), {"c"})
+        # 이미 본 이벤트의 변경은 기록하지 않음
+        self.assertEqual(store.upsert({"a": event("2026-10-17", seats=50)}), 0)
+        self.assertFalse(store._records_loaded)
+
+    def test_prune_removes_ids_and_records(self):
+        store = self.open()
+        store.upsert({"a": event("2026-10-16"), "b": event("2026-10-18")})
+        store.save()
+
+        store = self.open()
+        self.assertEqual(store.prune("2026-10-17"), 1)
+        store.save()
+
+        store = self.open()
+        self.assertEqual(store.unseen(["a", "b"]), {"a"})
+        self.assertEqual(set(store.export()), {"b"})
+
+    def test_missing_index_is_built_from_records(self):
+        records = JsonEventStore(self.path("events.json"), "playDate").load()
+        records.upsert({"a": event("2026-10-17")})
+        records.save()
+
+        store = self.open()
+        self.assertEqual(store.unseen(["a", "b"]), {"b"})
+        self.assertIn(id_hash("a"), store.index)
+
+    def test_kill_between_records_and_index_rebuilds_index(self):
+        store = self.open()
+        store.upsert({"a": event("2026-10-17")})
+        store.save()
+
+        # 이벤트 파일은 저장했지만 인덱스를 교체하기 전에 종료
+        store = self.open()
+        store.upsert({"b": event("2026-10-18")})
+        save_records = store.records.save
+
+        def save_then_die():
+            save_records()
+            raise KeyboardInterrupt
+
+        with mock.patch.object(store.records, "save", save_then_die), self.assertRaises(KeyboardInterrupt):
+            store.save()
+
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            store = self.open()
+        self.assertIn("인덱스를 다시 만듭니다", output.getvalue())
+        self.assertEqual(store.unseen(["a", "b"]), set())
+        self.assertFalse(os.path.exists(store.pending_path))
+
+        # 다시 만든 인덱스는 파일로 남아 다음 실행은 바로 읽음
+        store = self.open()
+        self.assertFalse(store._records_loaded)
+        self.assertEqual(store.unseen(["a", "b"]), set())
+
+    def test_kill_before_records_keeps_old_state(self):
+        store = self.open()
+        store.upsert({"a": event("2026-10-17")})
+        store.save()
+
+        store = self.open()
+        store.upsert({"b": event("2026-10-18")})
+        with mock.patch.object(store.records, "save", side_effect=KeyboardInterrupt), \
+                self.assertRaises(KeyboardInterrupt):
+            store.save()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            store = self.open()
+        # 저장되지 않은 b는 다음 실행에서 다시 새 이벤트로 잡힘
+        self.assertEqual(store.unseen(["a", "b"]), {"b"})
+
+    def test_seen_index_file_round_trip(self):
+        index = SeenIndex(self.path("events.seen"))
+        index.add(id_hash("a"), "2026-10-17")
+        index.add(id_hash("b"), "20261018")
+        index.save()
+
+        loaded = SeenIndex(index.path).load()
+        self.assertEqual(loaded.dates, {id_hash("a"): 20261017, id_hash("b"): 20261018})
+        self.assertEqual(os.path.getsize(index.path), 2 * 12)
+        self.assertEqual(loaded.expired("2026-10-18"), [id_hash("a")])
+
+
+if __name__ == "__main__":
+    unittest.main()
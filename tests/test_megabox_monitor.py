@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+megabox_monitor 지점 묶음 응답 나누기 테스트
+"""
+
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import megabox_monitor as mb  # noqa: E402
+
+BRANCHES = [{"brchNo": "1372", "brchNm": "강남"}, {"brchNo": "0023", "brchNm": "코엑스"}]
+
+
+class SplitBatchShowsTest(unittest.TestCase):
+    def test_rows_are_counted_per_branch(self):
+        result = {"movieFormList": [
+            {"brchNo": "1372", "movieNm": "영화 A"},
+            {"brchNo": 23, "movieNm": "영화 B"},
+            {"brchNo": "0023", "movieNm": "영화 C"},
+        ]}
+        shows_by_brch, unassigned = mb.split_batch_shows(BRANCHES, result)
+        self.assertEqual({no: len(shows) for no, shows in shows_by_brch.items()}, {"1372": 1, "0023": 1})
+        self.assertEqual(unassigned, 1)
+
+    def test_single_branch_keeps_rows_without_brch_no(self):
+        result = {"movieFormList": [{"movieNm": "영화 A"}, {"movieNm": "영화 B"}]}
+        shows_by_brch, unassigned = mb.split_batch_shows(BRANCHES[:1], result)
+        self.assertEqual(len(shows_by_brch["1372"]), 2)
+        self.assertEqual(unassigned, 0)
+
+    def test_unassigned_rows_are_logged(self):
+        result = {"movieFormList": [{"movieNm": "영화 A 무대인사"}]}
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            events = mb.parse_batch_shows(BRANCHES, "20261017", result)
+        self.assertEqual(events, {})
+        self.assertIn("지점을 알 수 없는 상영 1건", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
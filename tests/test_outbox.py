@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+outbox 묶음 전송 테스트 (가짜 sink로 메시지 크기 제한/거부 처리 확인)
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from discord_notifier import MAX_EMBED_CHARS_PER_MESSAGE, MAX_EMBEDS_PER_MESSAGE, embed_size  # noqa: E402
+import outbox  # noqa: E402
+from outbox import Outbox  # noqa: E402
+from sinks import REJECTED, SENT  # noqa: E402
+
+
+class RecordingSink:
+    """보낸 메시지를 기록하고, 제목이 bad인 embed가 든 메시지는 거부(400)하는 sink"""
+
+    def __init__(self, name="discord"):
+        self.name = name
+        self.messages = []
+        self._lock = threading.Lock()
+
+    def send(self, embeds):
+        with self._lock:
+            self.messages.append(embeds)
+        if any(embed["title"] == "bad" for embed in embeds):
+            return REJECTED
+        return SENT
+
+
+def render(events):
+    return {"title": events[0]["title"], "description": "x" * events[0]["size"]}
+
+
+class OutboxTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.sink = RecordingSink()
+        self.outbox = Outbox(os.path.join(self.tmpdir.name, "outbox.json"), [self.sink], render, window=0)
+
+    def send_all(self, events):
+        self.outbox.start()
+        self.outbox.put([(f"id{i}", f"group{i}", event, event["title"]) for i, event in enumerate(events)])
+        self.outbox.close(timeout=10)
+
+    def test_messages_stay_within_discord_limits(self):
+        self.send_all([{"title": f"event{i}", "size": 2500} for i in range(12)])
+
+        self.assertEqual(len(self.outbox), 0)
+        for embeds in self.sink.messages:
+            self.assertLessEqual(len(embeds), MAX_EMBEDS_PER_MESSAGE)
+            self.assertLessEqual(sum(embed_size(e) for e in embeds), MAX_EMBED_CHARS_PER_MESSAGE)
+        self.assertEqual([embed["title"] for embeds in self.sink.messages for embed in embeds],
+                         [f"event{i}" for i in range(12)])
+
+    def test_rejected_batch_is_retried_one_by_one(self):
+        self.send_all([{"title": "good1", "size": 10}, {"title": "bad", "size": 10}, {"title": "good2", "size": 10}])
+
+        self.assertEqual(len(self.outbox), 0)
+        self.assertEqual([len(embeds) for embeds in self.sink.messages], [3, 1, 1, 1])
+        self.assertEqual([embeds[0]["title"] for embeds in self.sink.messages[1:]], ["good1", "bad", "good2"])
+
+
+class FlakySink(RecordingSink):
+    """처음 failures번은 예외를 던지는 sink"""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def send(self, embeds):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        return super().send(embeds)
+
+
+class OutboxErrorTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        # 재시도 대기를 짧게
+        patcher = mock.patch.object(outbox, "OUTBOX_RETRY_BASE_DELAY", 0.01)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def start(self, sink, render_fn=render):
+        box = Outbox(os.path.join(self.tmpdir.name, "outbox.json"), [sink], render_fn, window=0)
+        box.start()
+        self.addCleanup(box.close, 1)
+        return box
+
+    def wait_until(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                self.fail("시간 초과")
+            time.sleep(0.01)
+
+    def test_sink_exception_is_retried(self):
+        sink = FlakySink(failures=2)
+        box = self.start(sink)
+        box.put([("id0", "group0", {"title": "event0", "size": 10}, "event0")])
+
+        self.wait_until(lambda: len(box) == 0)
+        self.assertEqual([embeds[0]["title"] for embeds in sink.messages], ["event0"])
+        self.assertTrue(box._worker.is_alive())
+
+    def test_render_error_keeps_other_groups_moving(self):
+        def flaky_render(events):
+            if events[0]["title"] == "broken":
+                raise KeyError("movie")
+            return render(events)
+
+        sink = RecordingSink()
+        box = self.start(sink, flaky_render)
+        box.put([("id0", "group0", {"title": "broken", "size": 10}, "broken"),
+                 ("id1", "group1", {"title": "event1", "size": 10}, "event1")])
+
+        self.wait_until(lambda: sink.messages)
+        self.assertEqual([embeds[0]["title"] for embeds in sink.messages], ["event1"])
+        self.assertEqual([entry["key"] for entry in box.entries], ["id0"])
+        self.assertTrue(box._worker.is_alive())
+
+    def test_close_timeout_does_not_crash_a_busy_worker(self):
+        entered = threading.Event()
+        release = threading.Event()
+
+        class SlowSink(RecordingSink):
+            def send(self, embeds):
+                entered.set()
+                release.wait(5)
+                return super().send(embeds)
+
+        errors = []
+        patcher = mock.patch.object(threading, "excepthook", errors.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        sink = SlowSink()
+        box = self.start(sink)
+        box.put([("id0", "group0", {"title": "event0", "size": 10}, "event0"),
+                 ("id1", "group1", {"title": "event1", "size": 5995}, "event1")])
+        self.assertTrue(entered.wait(5))
+        worker = box._worker
+        box.close(timeout=0.1)
+
+        # 닫힌 뒤 전송이 끝나면 남은 묶음(event1)은 보내지 않고 조용히 종료
+        release.set()
+        worker.join(5)
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(errors, [])
+        self.assertEqual([embeds[0]["title"] for embeds in sink.messages], ["event0"])
+        self.assertEqual([entry["key"] for entry in box.entries], ["id1"])
+
+    def test_save_error_does_not_stop_sending(self):
+        sink = RecordingSink()
+        box = self.start(sink)
+        with mock.patch.object(box, "_save", side_effect=[None, OSError("read-only"), None, None]):
+            box.put([("id0", "group0", {"title": "event0", "size": 10}, "event0")])
+            self.wait_until(lambda: len(box) == 0)
+            box.put([("id1", "group1", {"title": "event1", "size": 10}, "event1")])
+            self.wait_until(lambda: len(box) == 0)
+        self.assertEqual([embeds[0]["title"] for embeds in sink.messages], ["event0", "event1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
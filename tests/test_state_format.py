@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+state_format 압축 이벤트 형식 테스트 (msgpack/zstd와 JSON/zlib 대체 경로)
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import state_format  # noqa: E402
+from event_store import JsonEventStore, dump_json_events, load_json_events  # noqa: E402
+from state_format import pack_events, unpack_events  # noqa: E402
+
+EVENTS = {
+    "lotte_1": {"movie": "테스트 영화", "playDate": "2026-10-17", "seats": 120, "tags": ["무대인사"]},
+    "lotte_2": {"playDate": "2026-10-18", "movie": "다른 영화", "seats": 0, "tags": []},
+    "megabox_1": {"movie": "테스트 영화", "playDate": "2026-10-17", "hall": None},
+}
+
+
+def with_codecs(msgpack, zstandard):
+    """state_format이 쓸 선택 의존성 모듈 바꾸기 (None이면 설치되지 않은 환경)"""
+    stack = contextlib.ExitStack()
+    stack.enter_context(mock.patch.object(state_format, "msgpack", msgpack))
+    stack.enter_context(mock.patch.object(state_format, "zstandard", zstandard))
+    return stack
+
+
+def without_optional_codecs():
+    return with_codecs(None, None)
+
+
+class PackEventsTest(unittest.TestCase):
+    def assertRoundTrip(self, data):
+        restored = unpack_events(data)
+        self.assertEqual(restored, EVENTS)
+        # 필드 순서도 그대로
+        self.assertEqual([list(e) for e in restored.values()], [list(e) for e in EVENTS.values()])
+
+    def test_fallback_uses_json_and_zlib(self):
+        with without_optional_codecs():
+            data = pack_events(EVENTS)
+            self.assertEqual(data[:7], b"TMEV\x01jd")
+            self.assertRoundTrip(data)
+
+    @unittest.skipUnless(state_format.msgpack and state_format.zstandard, "msgpack/zstandard 미설치")
+    def test_optional_codecs_are_used_when_installed(self):
+        data = pack_events(EVENTS)
+        self.assertEqual(data[:7], b"TMEV\x01mz")
+        self.assertRoundTrip(data)
+
+    def test_fallback_file_is_read_with_optional_codecs(self):
+        with without_optional_codecs():
+            data = pack_events(EVENTS)
+        self.assertRoundTrip(data)
+
+    @unittest.skipUnless(state_format.msgpack and state_format.zstandard, "msgpack/zstandard 미설치")
+    def test_packed_file_needs_its_codecs(self):
+        data = pack_events(EVENTS)
+        with with_codecs(state_format.msgpack, None), self.assertRaisesRegex(RuntimeError, "zstandard"):
+            unpack_events(data)
+        with with_codecs(None, state_format.zstandard), self.assertRaisesRegex(RuntimeError, "msgpack"):
+            unpack_events(data)
+
+    def test_other_files_are_rejected(self):
+        with self.assertRaises(ValueError):
+            unpack_events(b'{"lotte_1": {}}')
+
+    def test_empty_events(self):
+        with without_optional_codecs():
+            self.assertEqual(unpack_events(pack_events({})), {})
+        self.assertEqual(unpack_events(pack_events({})), {})
+
+
+class PackedStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.json_path = os.path.join(self.tmpdir.name, "events.json")
+        self.bin_path = os.path.join(self.tmpdir.name, "events.bin")
+
+    def test_bin_store_imports_json_file_once(self):
+        dump_json_events(self.json_path, EVENTS)
+        store = JsonEventStore(self.bin_path, "playDate", import_from=self.json_path)
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            store.load()
+        self.assertIn("3개 이벤트 가져옴", output.getvalue())
+        store.prune("2026-10-18")
+        store.save()
+
+        with open(self.bin_path, "rb") as f:
+            self.assertEqual(f.read(4), b"TMEV")
+        reloaded = JsonEventStore(self.bin_path, "playDate", import_from=self.json_path).load()
+        self.assertEqual(set(reloaded.export()), {"lotte_2"})
+
+    def test_pack_and_unpack_by_extension(self):
+        with without_optional_codecs():
+            dump_json_events(self.bin_path, EVENTS)
+        dump_json_events(self.json_path, load_json_events(self.bin_path))
+        self.assertEqual(load_json_events(self.json_path), EVENTS)
+
+
+if __name__ == "__main__":
+    unittest.main()